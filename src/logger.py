@@ -11,6 +11,15 @@ from typing import Optional
 class VibeGuardLogger:
     """Custom logger for VibeGuard with GitHub Actions support"""
     
+    # Per-level message prefixes, applied lazily by the logging module
+    _PREFIX = {
+        logging.DEBUG: "🔍 %s",
+        logging.INFO: "📝 %s",
+        logging.WARNING: "⚠️  %s",
+        logging.ERROR: "❌ %s",
+        logging.CRITICAL: "💀 %s",
+    }
+    
     def __init__(self, name: str = "vibeguard", level: str = "INFO"):
         """
         Initialize logger
@@ -39,11 +48,13 @@ class VibeGuardLogger:
     
     def debug(self, message: str) -> None:
         """Log debug message"""
-        self.logger.debug(f"🔍 {message}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(self._PREFIX[logging.DEBUG], message)
     
     def info(self, message: str) -> None:
         """Log info message"""
-        self.logger.info(f"📝 {message}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(self._PREFIX[logging.INFO], message)
     
     def warning(self, message: str, file: Optional[str] = None, 
                 line: Optional[int] = None) -> None:
@@ -61,7 +72,7 @@ class VibeGuardLogger:
                 location += f",line={line}"
             print(f"::warning {location}::{message}", file=sys.stdout)
         else:
-            self.logger.warning(f"⚠️  {message}")
+            self.logger.warning(self._PREFIX[logging.WARNING], message)
     
     def error(self, message: str, file: Optional[str] = None, 
               line: Optional[int] = None) -> None:
@@ -79,11 +90,11 @@ class VibeGuardLogger:
                 location += f",line={line}"
             print(f"::error {location}::{message}", file=sys.stdout)
         else:
-            self.logger.error(f"❌ {message}")
+            self.logger.error(self._PREFIX[logging.ERROR], message)
     
     def critical(self, message: str) -> None:
         """Log critical message"""
-        self.logger.critical(f"💀 {message}")
+        self.logger.critical(self._PREFIX[logging.CRITICAL], message)
     
     def group_start(self, title: str) -> None:
         """
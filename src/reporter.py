@@ -4,8 +4,28 @@ Handles output formatting, GitHub annotations, and job summaries
 """
 
 import os
-from typing import List, Dict, Any
-from collections import defaultdict
+import sys
+from typing import List, Dict, Any, Tuple
+
+
+# Console summary used when no logger is attached
+_SUMMARY_TMPL = (
+    "\n=== VibeGuard Scan Complete (%s) ===\n"
+    "📁 Files Scanned: %d\n"
+    "⚠️  Total Violations: %d\n"
+    "📉 Total Deductions: %d pts\n"
+    "📊 Final Score: %d/%d\n"
+    "🎯 Threshold: %d\n"
+)
+_SUMMARY_PASSED_TMPL = "✅ VibeGuard PASSED: Score %d meets threshold %d\n"
+_SUMMARY_FAILED_TMPL = (
+    "❌ VibeGuard FAILED: Score %d is below threshold %d\n"
+    "Vibecoding detected! Clean up the code and try again.\n"
+)
+
+# Every possible job summary progress bar, indexed by filled cells
+_BAR_WIDTH = 20
+_BARS = tuple("█" * i + "░" * (_BAR_WIDTH - i) for i in range(_BAR_WIDTH + 1))
 
 
 class Reporter:
@@ -29,6 +49,32 @@ class Reporter:
         'git': '🌿 Git Hygiene'
     }
     
+    # Rule ID prefix (ID without its numeric suffix) -> category
+    _PREFIX_MAP = {
+        'SEC': 'security',
+        'STB': 'stability',
+        'MNT': 'maintainability',
+        'HYG': 'hygiene',
+        'SME': 'code_smell',
+        'TST': 'testing',
+        'PRF': 'performance',
+        'DOC': 'documentation',
+        'DEP': 'dependencies',
+        'VCS': 'vcs',
+        'NAM': 'naming',
+        'UX': 'ux',
+        'AI': 'ai_slop',
+        'RCT': 'react',
+        'GIT': 'git'
+    }
+    
+    # Categories in report order, plus 'other' for unknown prefixes
+    _CATEGORY_ORDER = tuple(sorted({*CATEGORY_NAMES, 'other'}))
+    _CAT_TO_IDX = {cat: i for i, cat in enumerate(_CATEGORY_ORDER)}
+    
+    # Job summary table row, bound once
+    _ROW_FMT = "| `{file}` | {rule} | {line} | -{deduction} |\n".format
+    
     def __init__(self, logger=None):
         """
         Initialize the reporter
@@ -37,18 +83,22 @@ class Reporter:
             logger: Logger instance for structured logging
         """
         self.logger = logger
+        self._annot_buf: List[str] = []
     
-    def print_github_annotation(self, violation: Dict[str, Any], 
-                               level: str = "warning") -> None:
+    def format_github_annotation(self, violation: Dict[str, Any], 
+                                 level: str = "warning") -> str:
         """
-        Print GitHub Actions annotation
+        Format a GitHub Actions annotation line for a violation
         
         Args:
             violation: Violation dictionary
             level: Annotation level ('error', 'warning', or 'notice')
+        
+        Returns:
+            Annotation workflow command, without trailing newline
         """
         file = violation.get('file', '')
-        line = violation.get('line', '')
+        line = violation.get('line')
         rule_id = violation.get('id', '')
         rule_name = violation.get('rule', '')
         deduction = violation.get('deduction', 0)
@@ -58,8 +108,42 @@ class Reporter:
         else:
             location = f"file={file}"
         
-        message = f"[{rule_id}] {rule_name} (-{deduction} pts)"
-        print(f"::{level} {location}::{message}")
+        return f"::{level} {location}::[{rule_id}] {rule_name} (-{deduction} pts)"
+    
+    def print_github_annotation(self, violation: Dict[str, Any], 
+                               level: str = "warning") -> None:
+        """
+        Print GitHub Actions annotation
+        
+        Args:
+            violation: Violation dictionary
+            level: Annotation level ('error', 'warning', or 'notice')
+        """
+        print(self.format_github_annotation(violation, level))
+    
+    def queue_github_annotation(self, violation: Dict[str, Any], 
+                                level: str = "warning") -> None:
+        """
+        Queue a GitHub Actions annotation for the next flush_annotations()
+        
+        Batch alternative to print_github_annotation() for large scans;
+        queued annotations are not printed until flushed.
+        
+        Args:
+            violation: Violation dictionary
+            level: Annotation level ('error', 'warning', or 'notice')
+        """
+        self._annot_buf.append(self.format_github_annotation(violation, level))
+    
+    def flush_annotations(self) -> None:
+        """Write all queued GitHub Actions annotations to stdout in one call"""
+        if not self._annot_buf:
+            return
+        
+        self._annot_buf.append("")
+        sys.stdout.write("\n".join(self._annot_buf))
+        sys.stdout.flush()
+        self._annot_buf.clear()
     
     def write_job_summary(self, score: int, threshold: int, 
                          starting_score: int, violations: List[Dict[str, Any]]) -> None:
@@ -79,12 +163,17 @@ class Reporter:
         status_emoji = "✅" if score >= threshold else "❌"
         status_text = "PASSED" if score >= threshold else "FAILED"
         
-        # Create progress bar
-        bar_width = 20
-        bar_filled = int((score / starting_score) * bar_width)
-        progress_bar = "█" * bar_filled + "░" * (bar_width - bar_filled)
+        # Pick the precomputed progress bar (scores can go negative)
+        bar_filled = int((score / starting_score) * _BAR_WIDTH)
+        progress_bar = _BARS[max(0, min(bar_filled, _BAR_WIDTH))]
+        
+        footer = (
+            "---\n\n"
+            f"*Scanned with VibeGuard Auditor • Threshold: {threshold} • [Learn More](https://github.com/fabriziosalmi/vibe-check)*\n"
+        )
         
-        md = f"""# {status_emoji} VibeGuard Code Quality Report
+        with open(summary_file, "a") as f:
+            f.write(f"""# {status_emoji} VibeGuard Code Quality Report
 
 ## 📊 Final Score
 
@@ -96,70 +185,64 @@ class Reporter:
 
 ## 📉 Violations Detected ({len(violations)})
 
-"""
-        
-        if violations:
-            # Group by category
-            categories = defaultdict(list)
-            for v in violations:
-                rule_id = v['id']
-                # Extract category from rule ID (first 3 chars) or use 'git' for GIT rules
-                if rule_id.startswith('GIT'):
-                    category = 'git'
-                else:
-                    # Map rule prefix to category
-                    category = self._get_category_from_rule_id(rule_id)
-                categories[category].append(v)
+""")
+            
+            if not violations:
+                # Nothing to group - write the empty report and stop
+                f.write("### 🎉 No violations found!\n\n")
+                f.write("Your code is **pristine**. Perfect SOTA engineering vibes. 🚀\n\n")
+                f.write(footer)
+                return
             
-            for cat_id in sorted(categories.keys()):
+            for cat_id, cat_violations, cat_total in self._group_by_category(violations):
                 cat_name = self.CATEGORY_NAMES.get(cat_id, cat_id.title())
-                cat_violations = categories[cat_id]
-                cat_total = sum(v['deduction'] for v in cat_violations)
                 
-                md += f"### {cat_name} (-{cat_total} pts)\n\n"
-                md += "| File | Rule | Line | Penalty |\n"
-                md += "|------|------|------|--------:|\n"
+                f.write(f"### {cat_name} (-{cat_total} pts)\n\n")
+                f.write("| File | Rule | Line | Penalty |\n")
+                f.write("|------|------|------|--------:|\n")
                 
                 for v in cat_violations[:10]:  # Limit to 10 per category
                     file_display = v['file'][:50] + "..." if len(v['file']) > 50 else v['file']
-                    line_info = f"L{v['line']}" if 'line' in v and v['line'] else "-"
-                    md += f"| `{file_display}` | {v['rule']} | {line_info} | -{v['deduction']} |\n"
+                    line_num = v.get('line')
+                    line_info = f"L{line_num}" if line_num else "-"
+                    f.write(self._ROW_FMT(file=file_display, rule=v['rule'], line=line_info, deduction=v['deduction']))
                 
                 if len(cat_violations) > 10:
-                    md += f"| ... | *{len(cat_violations) - 10} more violations* | ... | ... |\n"
+                    f.write(f"| ... | *{len(cat_violations) - 10} more violations* | ... | ... |\n")
                 
-                md += "\n"
-        else:
-            md += "### 🎉 No violations found!\n\n"
-            md += "Your code is **pristine**. Perfect SOTA engineering vibes. 🚀\n\n"
+                f.write("\n")
+            
+            f.write(footer)
+    
+    def _group_by_category(self, violations: List[Dict[str, Any]]) -> List[Tuple[str, List[Dict[str, Any]], int]]:
+        """
+        Group violations into report-ordered category buckets
         
-        md += "---\n\n"
-        md += f"*Scanned with VibeGuard Auditor • Threshold: {threshold} • [Learn More](https://github.com/fabriziosalmi/vibe-check)*\n"
+        Args:
+            violations: List of violation dictionaries
         
-        with open(summary_file, "a") as f:
-            f.write(md)
+        Returns:
+            List of (category, violations, total_deduction) for non-empty categories
+        """
+        cat_to_idx = self._CAT_TO_IDX
+        other_idx = cat_to_idx['other']
+        buckets = [[] for _ in self._CATEGORY_ORDER]
+        totals = [0] * len(self._CATEGORY_ORDER)
+        
+        for v in violations:
+            idx = cat_to_idx.get(self._get_category_from_rule_id(v['id']), other_idx)
+            buckets[idx].append(v)
+            totals[idx] += v['deduction']
+        
+        return [
+            (cat_id, buckets[idx], totals[idx])
+            for idx, cat_id in enumerate(self._CATEGORY_ORDER)
+            if buckets[idx]
+        ]
     
     def _get_category_from_rule_id(self, rule_id: str) -> str:
         """Map rule ID prefix to category"""
-        prefix_map = {
-            'SEC': 'security',
-            'STB': 'stability',
-            'MNT': 'maintainability',
-            'HYG': 'hygiene',
-            'SME': 'code_smell',
-            'TST': 'testing',
-            'PRF': 'performance',
-            'DOC': 'documentation',
-            'DEP': 'dependencies',
-            'VCS': 'vcs',
-            'NAM': 'naming',
-            'UX': 'ux',
-            'AI': 'ai_slop',
-            'RCT': 'react',
-            'GIT': 'git'
-        }
-        prefix = rule_id[:3]
-        return prefix_map.get(prefix, 'other')
+        return self._PREFIX_MAP.get(rule_id.rstrip('0123456789'), 'other')
     
     def write_github_output(self, score: int) -> None:
         """
@@ -202,18 +285,11 @@ class Reporter:
             else:
                 self.logger.error(f"❌ FAILED - Score below threshold")
         else:
-            print(f"\n=== VibeGuard Scan Complete ({mode_indicator}) ===")
-            print(f"📁 Files Scanned: {files_scanned}")
-            print(f"⚠️  Total Violations: {len(violations)}")
-            print(f"📉 Total Deductions: {starting_score - score} pts")
-            print(f"📊 Final Score: {score}/{starting_score}")
-            print(f"🎯 Threshold: {threshold}")
-            
-            if score >= threshold:
-                print(f"✅ VibeGuard PASSED: Score {score} meets threshold {threshold}")
-            else:
-                print(f"❌ VibeGuard FAILED: Score {score} is below threshold {threshold}")
-                print(f"Vibecoding detected! Clean up the code and try again.")
+            result_tmpl = _SUMMARY_PASSED_TMPL if score >= threshold else _SUMMARY_FAILED_TMPL
+            sys.stdout.write(_SUMMARY_TMPL % (
+                mode_indicator, files_scanned, len(violations),
+                starting_score - score, score, starting_score, threshold
+            ) + result_tmpl % (score, threshold))
     
     def print_violations_by_category(self, violations: List[Dict[str, Any]]) -> None:
         """
@@ -222,19 +298,16 @@ class Reporter:
         Args:
             violations: List of violation dictionaries
         """
-        categories = defaultdict(list)
-        for v in violations:
-            category = self._get_category_from_rule_id(v['id'])
-            categories[category].append(v)
+        if not violations:
+            return
         
-        for cat_id in sorted(categories.keys()):
+        for cat_id, cat_violations, cat_total in self._group_by_category(violations):
             cat_name = self.CATEGORY_NAMES.get(cat_id, cat_id.title())
-            cat_violations = categories[cat_id]
-            cat_total = sum(v['deduction'] for v in cat_violations)
             
             print(f"\n{cat_name} (-{cat_total} pts):")
             for v in cat_violations[:5]:  # Show top 5
-                line_info = f" (L{v['line']})" if 'line' in v and v['line'] else ""
+                line_num = v.get('line')
+                line_info = f" (L{line_num})" if line_num else ""
                 print(f"  • {v['file']}{line_info}: {v['rule']} (-{v['deduction']} pts)")
             
             if len(cat_violations) > 5:
@@ -4,19 +4,80 @@ Handles loading, filtering, and validation of VibeGuard rules
 """
 
 import os
+import re
+import pickle
+import hashlib
 import yaml
-from typing import List, Dict, Set, Any
+from typing import List, Dict, Set, Any, Tuple
+
+# Prefer libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# orjson is an optional speedup for config parsing
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+# google-re2 is an optional DFA prefilter for content rules
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+
+# Bump when the cached rule layout changes
+RULES_CACHE_VERSION = 4
+
+# Precomputed penalty column per mode (see RulesManager.penalty_key)
+_PENALTY_KEYS = {False: '_w1', True: '_w2'}
+
+# Content rules match case-insensitively and line-by-line
+CONTENT_REGEX_FLAGS = re.MULTILINE | re.IGNORECASE
+
+# Characters that make str regexes behave differently under re.ASCII:
+# anything non-ASCII, plus the separators Unicode \s also matches
+_UNICODE_SENSITIVE_RE = re.compile('[^\x00-\x1b\x20-\x7f]')
+
+
+def _compile_pattern(rule: Dict[str, Any], extra_flags: int = 0):
+    """
+    Compile a rule's pattern with the flags its rule type is matched with
+    
+    Args:
+        rule: Rule dictionary
+        extra_flags: Flags added on top of the rule type's flags
+    
+    Returns:
+        Compiled pattern, or None if the rule has no pattern
+    """
+    pattern = rule.get('pattern')
+    if pattern is None:
+        return None
+    
+    flags = (CONTENT_REGEX_FLAGS if rule['type'] == 'regex' else 0) | extra_flags
+    try:
+        return re.compile(pattern, flags)
+    except re.error as e:
+        raise ValueError(f"Invalid pattern in rule {rule['id']}: {e}") from e
 
 
 class RulesManager:
     """Manages loading and filtering of audit rules"""
     
-    def __init__(self, rules_path: str = None):
+    # Rule ID prefixes reported as GitHub errors; everything else is a warning
+    ERROR_PREFIXES = ('SEC', 'AI', 'VCS01')
+    
+    def __init__(self, rules_path: str = None, ignore_rules: Set[str] = None):
         """
         Initialize the rules manager
         
         Args:
             rules_path: Path to rules.yaml file. Defaults to config/rules.yaml
+            ignore_rules: Rule IDs to drop while loading. Ignored rules are
+                never indexed, so get_rule_by_id() does not resolve them either
         """
         if rules_path is None:
             # Default to config/rules.yaml relative to project root
@@ -25,23 +86,126 @@ class RulesManager:
         
         self.rules_path = rules_path
         self.rules: List[Dict[str, Any]] = []
-        self.ignore_rules: Set[str] = set()
+        self.total_rules = 0
+        self._ignore_rules: Set[str] = set(ignore_rules or ())
+        self._active_cache: List[Dict[str, Any]] = []
+        self._by_type: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_category: Dict[str, List[Dict[str, Any]]] = {}
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self.rule_level: Dict[str, str] = {}
+        self.load_rules()
+    
+    @property
+    def ignore_rules(self) -> Set[str]:
+        """Rule IDs excluded from the active rule set"""
+        return self._ignore_rules
+    
+    @ignore_rules.setter
+    def ignore_rules(self, value: Set[str]) -> None:
+        # Reload so rules ignored now are pruned exactly like those ignored at construction
+        self._ignore_rules = set(value)
         self.load_rules()
     
+    def _invalidate(self) -> None:
+        """Rebuild the lookup indexes after the loaded rules change"""
+        self._by_id = {r['id']: r for r in self.rules}
+        self.rule_level = {
+            rule_id: "error" if rule_id.startswith(self.ERROR_PREFIXES) else "warning"
+            for rule_id in self._by_id
+        }
+        self._active_cache = self.rules
+        
+        self._by_type = {}
+        self._by_category = {}
+        for rule in self._active_cache:
+            self._by_type.setdefault(rule['type'], []).append(rule)
+            self._by_category.setdefault(rule.get('category'), []).append(rule)
+        
+        # Rebuilt lazily by get_regex_candidates()
+        self._regex_prefilter = None
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drop the re2 prefilter when pickling (e.g. for scan worker processes)"""
+        state = self.__dict__.copy()
+        state['_regex_prefilter'] = None
+        return state
+    
+    def _cache_path(self) -> str:
+        """
+        Get the on-disk cache location for the parsed rules
+        
+        The cache lives in the user cache directory rather than next to
+        rules.yaml, so a scanned repository can never plant a pickle that
+        gets loaded.
+        
+        Returns:
+            Path to the pickle cache file
+        """
+        cache_root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        digest = hashlib.sha1(os.path.abspath(self.rules_path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(cache_root, 'vibeguard', f"rules-{digest}.pkl")
+    
     def load_rules(self) -> None:
-        """Load rules from YAML configuration file"""
+        """Load rules from YAML configuration file, dropping ignored rules"""
+        all_rules = self._read_rules()
+        self.total_rules = len(all_rules)
+        
+        if self._ignore_rules:
+            self.rules = [r for r in all_rules if r['id'] not in self._ignore_rules]
+        else:
+            self.rules = all_rules
+        
+        self._invalidate()
+    
+    def _read_rules(self) -> List[Dict[str, Any]]:
+        """
+        Read and flatten every rule in rules.yaml, reusing the parse cache when fresh
+        
+        Returns:
+            List of all rule dictionaries
+        """
         if not os.path.exists(self.rules_path):
             raise FileNotFoundError(f"Rules file not found: {self.rules_path}")
         
+        stat = os.stat(self.rules_path)
+        cache_key = (RULES_CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+        cache_path = self._cache_path()
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                cached_key, cached_rules = pickle.load(f)
+            if cached_key == cache_key:
+                return cached_rules
+        except Exception:
+            # Missing, stale or corrupt cache - fall back to YAML
+            pass
+        
         with open(self.rules_path, 'r', encoding='utf-8') as f:
-            rules_data = yaml.safe_load(f)
+            rules_data = yaml.load(f, Loader=_YamlLoader)
         
         # Flatten rules from categorized structure
-        self.rules = []
+        rules = []
         for category, rules_list in rules_data.items():
             for rule in rules_list:
                 rule['category'] = category
-                self.rules.append(rule)
+                rule['_w1'] = rule['weight']
+                rule['_w2'] = rule['weight'] * 2
+                rule['_compiled'] = _compile_pattern(rule)
+                # ASCII-mode twin for content that cannot tell the difference
+                rule['_compiled_ascii'] = (
+                    _compile_pattern(rule, re.ASCII) if rule['type'] == 'regex' else None
+                )
+                rules.append(rule)
+        
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((cache_key, rules), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            # Read-only or unavailable cache directory - caching is best effort
+            pass
+        
+        return rules
     
     def load_config(self, config_path: str = '.vibeguardrc') -> None:
         """
@@ -53,10 +217,9 @@ class RulesManager:
         if not os.path.exists(config_path):
             return
         
-        import json
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = _json.loads(f.read())
                 self.ignore_rules = set(config.get('ignore', []))
         except Exception as e:
             # Silently fail if config is malformed
@@ -69,7 +232,7 @@ class RulesManager:
         Returns:
             List of active rule dictionaries
         """
-        return [r for r in self.rules if r['id'] not in self.ignore_rules]
+        return self._active_cache
     
     def get_rule_by_id(self, rule_id: str) -> Dict[str, Any]:
         """
@@ -81,7 +244,7 @@ class RulesManager:
         Returns:
             Rule dictionary or None if not found
         """
-        return next((r for r in self.rules if r['id'] == rule_id), None)
+        return self._by_id.get(rule_id)
     
     def get_rules_by_type(self, rule_type: str) -> List[Dict[str, Any]]:
         """
@@ -93,7 +256,90 @@ class RulesManager:
         Returns:
             List of matching rule dictionaries
         """
-        return [r for r in self.get_active_rules() if r['type'] == rule_type]
+        return self._by_type.get(rule_type, [])
+    
+    @staticmethod
+    def content_pattern_key(content: str) -> str:
+        """
+        Get the rule key holding the fastest compiled pattern for some content
+        
+        Unicode-aware IGNORECASE and character classes make str regexes
+        noticeably slower than their re.ASCII equivalents. When the content
+        is plain ASCII without the separators only Unicode \\s matches,
+        both compile to the same matches, so the ASCII twin is used.
+        
+        Args:
+            content: File contents about to be scanned
+        
+        Returns:
+            Rule dictionary key ('_compiled_ascii' or '_compiled')
+        """
+        if content.isascii() and not _UNICODE_SENSITIVE_RE.search(content):
+            return '_compiled_ascii'
+        return '_compiled'
+    
+    def get_regex_candidates(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Get the active regex rules that can match the given content
+        
+        With google-re2 installed, one DFA pass over the content rules out
+        every re2-compatible rule that has no match. Rules re2 cannot
+        express (lookarounds, large counted repeats) are always returned.
+        The prefilter only runs where re2 and re agree: content that takes
+        the ASCII pattern path (see content_pattern_key) and has no \\x0b,
+        since re2's \\s matches neither \\x0b nor \\x1c-\\x1f.
+        
+        Args:
+            content: File contents about to be scanned
+        
+        Returns:
+            Active regex rules, in rule order, worth running through re
+        """
+        regex_rules = self.get_rules_by_type('regex')
+        if (_re2 is None or '\x0b' in content
+                or self.content_pattern_key(content) != '_compiled_ascii'):
+            return regex_rules
+        
+        if self._regex_prefilter is None:
+            self._regex_prefilter = self._build_regex_prefilter(regex_rules)
+        rule_set, set_indexes = self._regex_prefilter
+        if rule_set is None:
+            return regex_rules
+        
+        hits = set(rule_set.Match(content) or ())
+        return [
+            rule for rule, index in zip(regex_rules, set_indexes)
+            if index is None or index in hits
+        ]
+    
+    @staticmethod
+    def _build_regex_prefilter(regex_rules: List[Dict[str, Any]]) -> Tuple[Any, List[int]]:
+        """
+        Compile re2-compatible regex rules into a single RE2::Set
+        
+        Args:
+            regex_rules: Active regex rules
+        
+        Returns:
+            Tuple of (re2 Set or None, per-rule Set index or None)
+        """
+        options = _re2.Options()
+        options.log_errors = False
+        rule_set = _re2.Set.SearchSet(options)
+        
+        set_indexes = []
+        for rule in regex_rules:
+            try:
+                set_indexes.append(rule_set.Add('(?im)' + rule['pattern']))
+            except _re2.error:
+                # Unsupported by re2 - always run through re
+                set_indexes.append(None)
+        
+        if all(index is None for index in set_indexes):
+            return None, set_indexes
+        
+        rule_set.Compile()
+        return rule_set, set_indexes
     
     def get_critical_rules(self) -> List[Dict[str, Any]]:
         """
@@ -114,7 +360,7 @@ class RulesManager:
         Returns:
             List of rule dictionaries in the category
         """
-        return [r for r in self.get_active_rules() if r.get('category') == category]
+        return self._by_category.get(category, [])
     
     def calculate_penalty(self, rule: Dict[str, Any], brutal_mode: bool = False) -> int:
         """
@@ -127,15 +373,32 @@ class RulesManager:
         Returns:
             Penalty points
         """
-        weight = rule['weight']
-        return weight * 2 if brutal_mode else weight
+        brutal_mode = bool(brutal_mode)
+        # Hand-built rule dicts lack the precomputed columns
+        return rule.get(_PENALTY_KEYS[brutal_mode], rule['weight'] * (2 if brutal_mode else 1))
+    
+    @staticmethod
+    def penalty_key(brutal_mode: bool = False) -> str:
+        """
+        Get the rule key holding the precomputed penalty for a scan mode
+        
+        Hot loops resolve this once per scan and index rules with it
+        instead of calling calculate_penalty per violation.
+        
+        Args:
+            brutal_mode: Whether brutal mode is enabled
+        
+        Returns:
+            Rule dictionary key ('_w1' or '_w2')
+        """
+        return _PENALTY_KEYS[bool(brutal_mode)]
     
     def __len__(self) -> int:
-        """Return total number of rules"""
+        """Return number of loaded rules (excludes ignored rules)"""
         return len(self.rules)
     
     def __repr__(self) -> str:
         """String representation"""
         active = len(self.get_active_rules())
         ignored = len(self.ignore_rules)
-        return f"RulesManager({len(self.rules)} total, {active} active, {ignored} ignored)"
+        return f"RulesManager({self.total_rules} total, {active} active, {ignored} ignored)"
@@ -6,11 +6,178 @@ Handles file scanning, AST parsing, and violation detection
 import os
 import re
 import ast
+import json
+import hashlib
 import subprocess
+import time
+from bisect import bisect_left
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Any, Tuple
 from pathlib import Path
 
 
+_NEWLINE_RE = re.compile('\n')
+
+# Line boundaries str.splitlines() honours besides '\n' (text mode already folds '\r')
+_EXTRA_LINE_BREAK_RE = re.compile('[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+# Below this many files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+# Lazy commit messages (GIT01), matched against the whole message
+_LAZY_COMMIT_RE = re.compile(
+    r'^(?:wip|fix|test|asdasd|asd|tmp|temp|debug|update|changes'
+    r'|merge|rebase|commit|push'
+    r'|\.'
+    r'|[0-9]+)$',
+    re.IGNORECASE
+)
+
+# Unprofessional keywords (GIT03), found anywhere in the message
+_UNPRO_KEYWORDS = ['oops', 'lol', 'yolo', 'fml', 'wtf', 'fuck',
+                   'shit', 'hope this works', 'fingers crossed', 'idk']
+_UNPRO_COMMIT_RE = re.compile('|'.join(map(re.escape, _UNPRO_KEYWORDS)), re.IGNORECASE)
+
+def _count_lines(content: str) -> int:
+    """
+    Count lines the way len(content.splitlines()) does, without building the list
+    
+    Args:
+        content: File contents read in text mode
+    
+    Returns:
+        Number of lines
+    """
+    if _EXTRA_LINE_BREAK_RE.search(content):
+        return len(content.splitlines())
+    
+    count = content.count('\n')
+    if content and not content.endswith('\n'):
+        count += 1
+    return count
+
+
+def _match_lines(matches, newline_offsets: List[int]):
+    """
+    Yield the distinct line numbers of regex matches
+    
+    Args:
+        matches: Matches in content order, e.g. from finditer
+        newline_offsets: Offsets of every newline in the content
+    
+    Yields:
+        1-based line numbers, each line once
+    """
+    last_line = None
+    for match in matches:
+        # Newlines strictly before the match start
+        line_num = bisect_left(newline_offsets, match.start()) + 1
+        # Matches come in order, so repeats on a line are adjacent
+        if line_num != last_line:
+            last_line = line_num
+            yield line_num
+
+
+# Regex syntax whose result can depend on what follows a match ($, \Z, \b,
+# \B and lookarounds). Exclude patterns without it match every path under
+# a directory they match, so the directory can be skipped outright.
+_LOOKAHEAD_TOKEN_RE = re.compile(r'\$|\\[ZbB]|\(\?[=!<]')
+
+
+# Bump when _PythonCallVisitor starts collecting different calls
+AST_CACHE_VERSION = 2
+
+# Entries kept in the AST cache; the least recently used are evicted past this
+AST_CACHE_MAX_ENTRIES = 4096
+
+# Temporary files older than this (seconds) are leftovers of interrupted writes
+_AST_CACHE_TMP_MAX_AGE = 3600
+
+
+def _ast_cache_dir() -> str:
+    """Get the user cache directory holding parsed Python call sites"""
+    cache_root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_root, 'vibeguard', 'ast')
+
+
+def _prune_ast_cache(max_entries: int = AST_CACHE_MAX_ENTRIES) -> None:
+    """
+    Evict the least recently used AST cache entries beyond max_entries
+    
+    Cache hits refresh an entry's mtime, so the oldest entries are the
+    least recently used. Temporary files left by interrupted writes are
+    removed too. Failures are ignored - the cache is best effort.
+    
+    Args:
+        max_entries: Number of entries to keep
+    """
+    cache_dir = _ast_cache_dir()
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    
+    entries = [name for name in names if name.endswith('.json')]
+    stale_before = time.time() - _AST_CACHE_TMP_MAX_AGE
+    evict = []
+    for name in names:
+        if name.endswith('.tmp'):
+            path = os.path.join(cache_dir, name)
+            try:
+                if os.stat(path).st_mtime < stale_before:
+                    evict.append(path)
+            except OSError:
+                pass
+    
+    if len(entries) > max_entries:
+        by_age = []
+        for name in entries:
+            path = os.path.join(cache_dir, name)
+            try:
+                by_age.append((os.stat(path).st_mtime_ns, path))
+            except OSError:
+                pass
+        by_age.sort()
+        evict.extend(path for _, path in by_age[:len(by_age) - max_entries])
+    
+    for path in evict:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+# Scanner installed in each pool worker by _init_worker
+_worker_scanner = None
+
+
+def _init_worker(scanner: 'CodeScanner') -> None:
+    """Install the scanner (and its compiled rules) once per worker process"""
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _scan_chunk(filepaths: List[str], brutal_mode: bool) -> Tuple[List['Violation'], int]:
+    """
+    Scan a batch of files in a worker process
+    
+    Args:
+        filepaths: Files to scan
+        brutal_mode: Whether brutal mode is enabled
+    
+    Returns:
+        Tuple of (violations, files_scanned)
+    """
+    scanner = _worker_scanner
+    scanner.files_scanned = 0
+    violations = []
+    for filepath in filepaths:
+        violations.extend(scanner.scan_file(filepath, brutal_mode))
+    return violations, scanner.files_scanned
+
+
 class Violation:
     """Represents a single code violation"""
     
@@ -24,17 +191,33 @@ class Violation:
         self.line = line
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization"""
-        result = {
+        """Convert to dictionary for serialization ('line' is None when unknown)"""
+        return {
             'file': self.file,
             'id': self.rule_id,
             'rule': self.rule_name,
             'deduction': self.deduction,
-            'desc': self.desc
+            'desc': self.desc,
+            'line': self.line
         }
-        if self.line:
-            result['line'] = self.line
-        return result
+
+
+class _PythonCallVisitor(ast.NodeVisitor):
+    """Single-pass AST visitor that collects calls to the builtins we track"""
+    
+    # Builtin names whose calls map to AST rules (see CodeScanner.check_python_ast_violations)
+    TRACKED_CALLS = frozenset({'eval', 'print'})
+    
+    def __init__(self):
+        self.calls: List[Tuple[str, int]] = []
+    
+    def visit_Call(self, node: ast.Call) -> None:
+        """Record calls to tracked builtins, then descend into arguments"""
+        # Only ast.Name carries an 'id', so this skips attribute calls too
+        name = getattr(node.func, 'id', None)
+        if name in self.TRACKED_CALLS:
+            self.calls.append((name, node.lineno))
+        self.generic_visit(node)
 
 
 class CodeScanner:
@@ -42,7 +225,8 @@ class CodeScanner:
     
     # Directories to ignore during scanning
     IGNORE_DIRS = {'.git', '.github', 'node_modules', 'dist', 'build', 
-                   'venv', '__pycache__', '.venv', 'vendor', '.pytest_cache'}
+                   'venv', '__pycache__', '.venv', 'vendor', '.pytest_cache',
+                   '.mypy_cache', '.ruff_cache', '.tox', '.nox'}
     
     # Files to ignore during scanning
     IGNORE_FILES = {'package-lock.json', 'yarn.lock', 'poetry.lock', 
@@ -54,7 +238,14 @@ class CodeScanner:
                       '.scss', '.sass', '.vue', '.svelte', '.md', '.txt', 
                       '.yml', '.yaml', '.json', '.xml', '.sh', '.bash'}
     
-    def __init__(self, rules_manager, exclude_patterns: List[str] = None, logger=None):
+    # Line comment prefixes per extension (see is_comment_line)
+    _COMMENT_PREFIXES = {
+        **dict.fromkeys(('.py', '.sh', '.bash', '.yml', '.yaml'), ('#',)),
+        **dict.fromkeys(('.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.go'), ('//', '*')),
+    }
+    
+    def __init__(self, rules_manager, exclude_patterns: List[str] = None, logger=None,
+                 workers: int = None):
         """
         Initialize the code scanner
         
@@ -62,9 +253,14 @@ class CodeScanner:
             rules_manager: RulesManager instance
             exclude_patterns: List of regex patterns for files to exclude
             logger: Logger instance for structured logging
+            workers: Worker processes for scan_directory. Defaults to the CPU count; 1 scans serially
         """
         self.rules_manager = rules_manager
+        self.workers = max(1, workers or os.cpu_count() or 1)
         self.exclude_patterns = exclude_patterns or []
+        self._exclude_res = [re.compile(p.replace('*', '.*')) for p in self.exclude_patterns]
+        # Patterns that can prune whole directories (see _walk_files)
+        self._prune_res = [r for r in self._exclude_res if not _LOOKAHEAD_TOKEN_RE.search(r.pattern)]
         self.logger = logger
         self.violations: List[Violation] = []
         self.files_scanned = 0
@@ -79,8 +275,24 @@ class CodeScanner:
         Returns:
             True if file should be excluded
         """
-        for pattern in self.exclude_patterns:
-            if re.match(pattern.replace('*', '.*'), filepath):
+        for pattern in self._exclude_res:
+            if pattern.match(filepath):
+                return True
+        return False
+    
+    def _is_pruned(self, dirpath: str) -> bool:
+        """
+        Check if every file under a directory is excluded
+        
+        Args:
+            dirpath: Directory path, relative like the paths is_excluded sees
+        
+        Returns:
+            True if the directory can be skipped without scanning it
+        """
+        dir_prefix = dirpath + os.sep
+        for pattern in self._prune_res:
+            if pattern.match(dir_prefix):
                 return True
         return False
     
@@ -95,12 +307,7 @@ class CodeScanner:
         Returns:
             True if line is a comment
         """
-        stripped = line.strip()
-        if file_ext in ['.py', '.sh', '.bash', '.yml', '.yaml']:
-            return stripped.startswith('#')
-        elif file_ext in ['.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.go']:
-            return stripped.startswith('//') or stripped.startswith('*')
-        return False
+        return line.lstrip().startswith(self._COMMENT_PREFIXES.get(file_ext, ()))
     
     def has_ignore_comment(self, line: str, next_line: str = None) -> bool:
         """
@@ -133,60 +340,123 @@ class CodeScanner:
             content: File contents
             brutal_mode: Whether brutal mode is enabled
         
+        Returns:
+            List of Violation objects
+        """
+        calls = self._get_python_calls(content)
+        return self._python_call_violations(filepath, content, calls or [], brutal_mode)
+    
+    def _python_call_violations(self, filepath: str, content: str,
+                                calls: List[Tuple[str, int]], brutal_mode: bool) -> List[Violation]:
+        """
+        Turn collected call sites into violations for the AST rules
+        
+        Args:
+            filepath: Path to Python file
+            content: File contents
+            calls: (builtin name, line number) pairs from _get_python_calls()
+            brutal_mode: Whether brutal mode is enabled
+        
         Returns:
             List of Violation objects
         """
         violations = []
-        try:
-            tree = ast.parse(content)
-            lines = content.splitlines()
+        if not calls:
+            return violations
+        
+        # Resolve rules once per file; None when the rule is ignored, since
+        # RulesManager never loads ignored rules however they were ignored
+        handlers = {
+            'eval': (self.rules_manager.get_rule_by_id('SEC06'), 'Real eval() call detected via AST'),
+        }
+        # print() is allowed in test files
+        if 'test' not in filepath.lower():
+            handlers['print'] = (self.rules_manager.get_rule_by_id('HYG02'), 'Print statement in production code')
+        
+        penalty_key = self.rules_manager.penalty_key(brutal_mode)
+        # Without the marker anywhere in the file no line can opt out
+        check_ignores = 'vibeguard' in content
+        lines = None
+        for name, line_num in calls:
+            rule, desc = handlers.get(name, (None, None))
+            if not rule:
+                continue
             
-            for node in ast.walk(tree):
-                # Detect eval() usage
-                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
-                    if node.func.id == 'eval':
-                        # Check for ignore comment
-                        line_num = node.lineno
-                        current_line = lines[line_num - 1] if line_num <= len(lines) else ""
-                        next_line = lines[line_num] if line_num < len(lines) else ""
-                        
-                        if not self.has_ignore_comment(current_line, next_line):
-                            rule = self.rules_manager.get_rule_by_id('SEC06')
-                            if rule:
-                                penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
-                                violations.append(Violation(
-                                    file=filepath,
-                                    rule_id='SEC06',
-                                    rule_name=rule['name'],
-                                    deduction=penalty,
-                                    desc='Real eval() call detected via AST',
-                                    line=line_num
-                                ))
-                    
-                    # Detect print() in non-test files
-                    elif node.func.id == 'print' and 'test' not in filepath.lower():
-                        line_num = node.lineno
-                        current_line = lines[line_num - 1] if line_num <= len(lines) else ""
-                        next_line = lines[line_num] if line_num < len(lines) else ""
-                        
-                        if not self.has_ignore_comment(current_line, next_line):
-                            rule = self.rules_manager.get_rule_by_id('HYG02')
-                            if rule:
-                                penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
-                                violations.append(Violation(
-                                    file=filepath,
-                                    rule_id='HYG02',
-                                    rule_name=rule['name'],
-                                    deduction=penalty,
-                                    desc='Print statement in production code',
-                                    line=line_num
-                                ))
+            if check_ignores:
+                if lines is None:
+                    lines = content.splitlines()
+                current_line = lines[line_num - 1] if line_num <= len(lines) else ""
+                next_line = lines[line_num] if line_num < len(lines) else ""
+                if self.has_ignore_comment(current_line, next_line):
+                    continue
+            
+            violations.append(Violation(
+                file=filepath,
+                rule_id=rule['id'],
+                rule_name=rule['name'],
+                deduction=rule[penalty_key],
+                desc=desc,
+                line=line_num
+            ))
         
+        return violations
+    
+    def _get_python_calls(self, content: str) -> List[Tuple[str, int]]:
+        """
+        Get the tracked builtin calls in Python source, reusing the AST cache
+        
+        Parsing is the expensive part of the AST rules, and what it yields
+        depends only on the source, so results are cached on disk keyed by
+        a hash of the content. Unchanged files skip ast.parse on reruns.
+        Hits refresh the entry's mtime so scan_directory() can evict the
+        least recently used entries (see _prune_ast_cache).
+        
+        Args:
+            content: Python source
+        
+        Returns:
+            List of (builtin name, line number) in source order, or None
+            if the source does not parse
+        """
+        digest = hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16)
+        digest.update(AST_CACHE_VERSION.to_bytes(2, 'little'))
+        cache_path = os.path.join(_ast_cache_dir(), digest.hexdigest() + '.json')
+        
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            calls = None if cached is None else [tuple(call) for call in cached]
+        except (OSError, ValueError, TypeError):
+            # Missing or corrupt entry - parse the source
+            pass
+        else:
+            try:
+                # Mark the entry as recently used
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return calls
+        
+        try:
+            visitor = _PythonCallVisitor()
+            visitor.visit(ast.parse(content, type_comments=False))
+            calls = visitor.calls
         except SyntaxError:
-            # Ignore syntax errors - regex will still catch some issues
+            # Unparseable - only the regex rules apply to this file
+            calls = None
+        
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write then rename so concurrent workers never read a partial entry
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(calls, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Read-only or unavailable cache directory - caching is best effort
             pass
         
-        return violations
+        return calls
     
     def scan_file(self, filepath: str, brutal_mode: bool = False) -> List[Violation]:
         """
@@ -200,13 +470,14 @@ class CodeScanner:
             List of Violation objects
         """
         violations = []
+        penalty_key = self.rules_manager.penalty_key(brutal_mode)
         filename = os.path.basename(filepath)
         file_ext = os.path.splitext(filename)[1]
         
         # Check filename rules
         for rule in self.rules_manager.get_rules_by_type('filename'):
-            if re.search(rule['pattern'], filename):
-                penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
+            if rule['_compiled'].search(filename):
+                penalty = rule[penalty_key]
                 violations.append(Violation(
                     file=filepath,
                     rule_id=rule['id'],
@@ -217,8 +488,8 @@ class CodeScanner:
         
         # Check path rules
         for rule in self.rules_manager.get_rules_by_type('path'):
-            if re.search(rule['pattern'], filepath):
-                penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
+            if rule['_compiled'].search(filepath):
+                penalty = rule[penalty_key]
                 violations.append(Violation(
                     file=filepath,
                     rule_id=rule['id'],
@@ -232,33 +503,36 @@ class CodeScanner:
             try:
                 with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read()
-                    lines = content.splitlines()
+                    # Split lazily - most files never need their lines
+                    lines = None
                     self.files_scanned += 1
                     
                     # Python AST analysis for precision
                     if file_ext == '.py':
-                        ast_violations = self.check_python_ast_violations(
+                        violations.extend(self.check_python_ast_violations(
                             filepath, content, brutal_mode
-                        )
-                        violations.extend(ast_violations)
+                        ))
                     
                     # Check line count
+                    line_count = None
                     for rule in self.rules_manager.get_rules_by_type('lines'):
+                        if line_count is None:
+                            line_count = _count_lines(content)
                         max_lines = rule.get('max', float('inf'))
-                        if len(lines) > max_lines:
-                            penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
+                        if line_count > max_lines:
+                            penalty = rule[penalty_key]
                             violations.append(Violation(
                                 file=filepath,
                                 rule_id=rule['id'],
-                                rule_name=f"{rule['name']} ({len(lines)} lines)",
+                                rule_name=f"{rule['name']} ({line_count} lines)",
                                 deduction=penalty,
                                 desc=rule['desc']
                             ))
                     
                     # Check EOF newline
-                    for rule in self.rules_manager.get_rules_by_type('eof'):
-                        if content and not content.endswith('\n'):
-                            penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
+                    if content and not content.endswith('\n'):
+                        for rule in self.rules_manager.get_rules_by_type('eof'):
+                            penalty = rule[penalty_key]
                             violations.append(Violation(
                                 file=filepath,
                                 rule_id=rule['id'],
@@ -268,25 +542,40 @@ class CodeScanner:
                             ))
                     
                     # Check regex patterns with smart comment detection
-                    for rule in self.rules_manager.get_rules_by_type('regex'):
-                        pattern = rule['pattern']
-                        matches = list(re.finditer(pattern, content, re.MULTILINE | re.IGNORECASE))
+                    newline_offsets = None
+                    pattern_key = self.rules_manager.content_pattern_key(content)
+                    for rule in self.rules_manager.get_regex_candidates(content):
+                        matches = rule[pattern_key].finditer(content)
+                        first_match = next(matches, None)
+                        if first_match is None:
+                            continue
+                        
+                        if newline_offsets is None:
+                            newline_offsets = [m.start() for m in _NEWLINE_RE.finditer(content)]
+                            lines = content.splitlines()
+                            # Without the marker anywhere in the file no line can opt out
+                            check_ignores = 'vibeguard' in content
                         
-                        for match in matches[:3]:  # Limit to 3 matches per rule per file
-                            line_num = content[:match.start()].count('\n') + 1
+                        # Each rule is reported at most once per line, and only the
+                        # first 3 matched lines per rule per file are considered
+                        # (ignored and comment lines included), so stop the regex
+                        # engine there
+                        matched_lines = _match_lines(chain((first_match,), matches), newline_offsets)
+                        for line_num in islice(matched_lines, 3):
                             line_content = lines[line_num - 1] if line_num <= len(lines) else ""
                             
                             # Check for ignore comment
-                            next_line = lines[line_num] if line_num < len(lines) else ""
-                            if self.has_ignore_comment(line_content, next_line):
-                                continue
+                            if check_ignores:
+                                next_line = lines[line_num] if line_num < len(lines) else ""
+                                if self.has_ignore_comment(line_content, next_line):
+                                    continue
                             
                             # Smart filtering: Skip code-related rules if line is a comment
                             is_comment = self.is_comment_line(line_content, file_ext)
                             if is_comment and not rule['id'].startswith(('DOC', 'STB03', 'STB04', 'STB05')):
                                 continue
                             
-                            penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
+                            penalty = rule[penalty_key]
                             violations.append(Violation(
                                 file=filepath,
                                 rule_id=rule['id'],
@@ -306,6 +595,8 @@ class CodeScanner:
         """
         Recursively scan a directory for violations
         
+        Afterwards the AST cache is trimmed to AST_CACHE_MAX_ENTRIES.
+        
         Args:
             root_dir: Root directory to scan
             brutal_mode: Whether brutal mode is enabled
@@ -316,24 +607,100 @@ class CodeScanner:
         self.violations = []
         self.files_scanned = 0
         
-        for root, dirs, files in os.walk(root_dir):
-            # Filter directories to ignore
-            dirs[:] = [d for d in dirs if d not in self.IGNORE_DIRS]
+        filepaths = []
+        for filepath in self._walk_files(root_dir):
+            # Check exclusion patterns
+            if self.is_excluded(filepath):
+                continue
             
-            for file in files:
-                if file in self.IGNORE_FILES:
-                    continue
-                
-                filepath = os.path.relpath(os.path.join(root, file))
-                
-                # Check exclusion patterns
-                if self.is_excluded(filepath):
-                    continue
-                
-                file_violations = self.scan_file(filepath, brutal_mode)
-                self.violations.extend(file_violations)
+            filepaths.append(filepath)
+        
+        if self.workers > 1 and len(filepaths) >= PARALLEL_MIN_FILES:
+            try:
+                self._scan_parallel(filepaths, brutal_mode)
+                _prune_ast_cache()
+                return self.violations
+            except (OSError, ImportError, NotImplementedError, BrokenProcessPool) as e:
+                # Platforms without working multiprocessing, or workers that
+                # die before finishing, fall back to serial
+                if self.logger:
+                    self.logger.debug(f"Parallel scan unavailable ({e}), scanning serially")
+                self.violations = []
+                self.files_scanned = 0
+        
+        for filepath in filepaths:
+            self.violations.extend(self.scan_file(filepath, brutal_mode))
         
+        _prune_ast_cache()
         return self.violations
+    
+    def _walk_files(self, root_dir: str):
+        """
+        Yield the paths of files under root_dir, skipping ignored names
+        
+        Walks with os.scandir so ignored directories and files are dropped
+        by name before any stat, and directory checks reuse the cached
+        DirEntry type. Files come out in the same order as a top-down
+        os.walk; symlinked directories are not followed.
+        
+        Paths are built relative to the current directory by joining
+        names onto os.path.relpath(root_dir), computed once, rather
+        than calling os.path.relpath per file. Directories matching an
+        exclude pattern that would exclude everything below them are
+        not descended into.
+        
+        Args:
+            root_dir: Root directory to walk
+        
+        Yields:
+            File paths relative to the current directory
+        """
+        stack = [os.path.relpath(root_dir)]
+        while stack:
+            directory = stack.pop()
+            prefix = '' if directory == os.curdir else directory + os.sep
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        
+                        if is_dir:
+                            if name not in self.IGNORE_DIRS and not entry.is_symlink():
+                                path = prefix + name
+                                if not self._is_pruned(path):
+                                    subdirs.append(path)
+                        elif name not in self.IGNORE_FILES:
+                            yield prefix + name
+            except OSError:
+                # Unreadable directory - skip it like os.walk does
+                continue
+            
+            # Reverse so subdirectories are visited in listing order
+            stack.extend(reversed(subdirs))
+    
+    def _scan_parallel(self, filepaths: List[str], brutal_mode: bool) -> None:
+        """
+        Scan files across a process pool, preserving file order in the results
+        
+        Args:
+            filepaths: Files to scan
+            brutal_mode: Whether brutal mode is enabled
+        """
+        workers = min(self.workers, len(filepaths))
+        chunksize = max(1, len(filepaths) // (4 * workers))
+        chunks = [filepaths[i:i + chunksize] for i in range(0, len(filepaths), chunksize)]
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            for violations, files_scanned in pool.map(_scan_chunk, chunks,
+                                                      [brutal_mode] * len(chunks)):
+                self.violations.extend(violations)
+                self.files_scanned += files_scanned
 
 
 class GitScanner:
@@ -349,6 +716,46 @@ class GitScanner:
         """
         self.rules_manager = rules_manager
         self.logger = logger
+        self._prefetched = None
+    
+    def prefetch_history(self, commit_limit: int = 50) -> None:
+        """
+        Start git log in the background
+        
+        The git process then runs while files are scanned; a later
+        scan_history() call with the same commit_limit collects its output.
+        Failures are left for scan_history() to report.
+        
+        Args:
+            commit_limit: Number of commits to read
+        """
+        try:
+            self._prefetched = (commit_limit, self._start_log(commit_limit))
+        except Exception:
+            self._prefetched = None
+    
+    def cancel_prefetch(self) -> None:
+        """Stop and reap a prefetched git log that scan_history() will not collect"""
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched:
+            self._stop_process(prefetched[1])
+    
+    @staticmethod
+    def _stop_process(process) -> None:
+        """
+        Kill a git process if still running and wait for it, closing its pipes
+        
+        Args:
+            process: subprocess.Popen, or None
+        """
+        if process is None:
+            return
+        try:
+            process.kill()
+        except OSError:
+            # Already exited
+            pass
+        process.communicate()
     
     def scan_history(self, brutal_mode: bool = False, 
                     commit_limit: int = 50) -> Tuple[int, List[Dict]]:
@@ -365,35 +772,38 @@ class GitScanner:
         violations = []
         total_deductions = 0
         
+        prefetched, self._prefetched = self._prefetched, None
+        
         # Check if .git directory exists
         if not os.path.isdir('.git'):
+            if prefetched:
+                self._stop_process(prefetched[1])
             if self.logger:
                 self.logger.warning("Git history audit skipped (no .git directory found)")
             return 0, []
         
         try:
-            # Fix GitHub Actions dubious ownership issue
-            subprocess.run(
-                ['git', 'config', '--global', '--add', 'safe.directory', '*'],
-                capture_output=True,
-                timeout=5
-            )
+            if prefetched and prefetched[0] == commit_limit and prefetched[1]:
+                process = prefetched[1]
+            else:
+                # Reap a prefetch for a different commit_limit before replacing it
+                if prefetched:
+                    self._stop_process(prefetched[1])
+                process = self._start_log(commit_limit)
             
-            # Get commit history
-            result = subprocess.run(
-                ['git', 'log', '-n', str(commit_limit), 
-                 '--pretty=format:%H|%an|%cd|%s', '--date=format:%a %H:%M'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            try:
+                stdout, stderr = process.communicate(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
             
-            if result.returncode != 0:
+            if process.returncode != 0:
                 if self.logger:
-                    self.logger.warning(f"Git history audit skipped: {result.stderr[:100]}")
+                    self.logger.warning(f"Git history audit skipped: {stderr[:100]}")
                 return 0, []
             
-            commits = result.stdout.strip().split('\n')
+            commits = stdout.strip().split('\n')
             
             if not commits or len(commits) <= 1 or commits[0] == '':
                 if self.logger:
@@ -415,22 +825,42 @@ class GitScanner:
         
         return total_deductions, violations
     
+    def _start_log(self, commit_limit: int):
+        """
+        Launch git log for the last commit_limit commits
+        
+        Args:
+            commit_limit: Number of commits to read
+        
+        Returns:
+            Running subprocess.Popen, or None outside a git checkout
+        """
+        if not os.path.isdir('.git'):
+            return None
+        
+        # Fix GitHub Actions dubious ownership issue. Only needed on the
+        # runner - locally it would add another entry to the user's global config
+        if os.environ.get('GITHUB_ACTIONS') == 'true':
+            subprocess.run(
+                ['git', 'config', '--global', '--add', 'safe.directory', '*'],
+                capture_output=True,
+                timeout=5
+            )
+        
+        # Get commit history
+        return subprocess.Popen(
+            ['git', 'log', '-n', str(commit_limit), 
+             '--pretty=format:%H|%an|%cd|%s', '--date=format:%a %H:%M'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+    
     def _analyze_commits(self, commits: List[str], brutal_mode: bool) -> Tuple[List[Dict], int]:
         """Analyze commit messages and metadata"""
         violations = []
         total_deductions = 0
-        
-        # Patterns for lazy commits
-        lazy_patterns = [
-            r'^(wip|fix|test|asdasd|asd|tmp|temp|debug|update|changes)$',
-            r'^(merge|rebase|commit|push)$',
-            r'^\.$',
-            r'^[0-9]+$',
-        ]
-        
-        # Unprofessional keywords
-        unpro_keywords = ['oops', 'lol', 'yolo', 'fml', 'wtf', 'fuck', 
-                         'shit', 'hope this works', 'fingers crossed', 'idk']
+        penalty_key = self.rules_manager.penalty_key(brutal_mode)
         
         for commit_line in commits:
             if not commit_line:
@@ -446,49 +876,50 @@ class GitScanner:
             message = parts[3].lower()
             
             # GIT01: Lazy commit message
-            for pattern in lazy_patterns:
-                if re.match(pattern, message, re.IGNORECASE):
-                    rule = self.rules_manager.get_rule_by_id('GIT01')
-                    if rule:
-                        penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
-                        total_deductions += penalty
-                        violations.append({
-                            "file": f"commit {commit_hash}",
-                            "rule": rule['name'],
-                            "id": rule['id'],
-                            "deduction": penalty,
-                            "desc": f"'{message[:50]}' provides zero context"
-                        })
-                    break
+            if _LAZY_COMMIT_RE.match(message):
+                rule = self.rules_manager.get_rule_by_id('GIT01')
+                if rule:
+                    penalty = rule[penalty_key]
+                    total_deductions += penalty
+                    violations.append({
+                        "file": f"commit {commit_hash}",
+                        "rule": rule['name'],
+                        "id": rule['id'],
+                        "deduction": penalty,
+                        "desc": f"'{message[:50]}' provides zero context",
+                        "line": None
+                    })
             
             # GIT02: Revert war
             if 'revert "revert' in message:
                 rule = self.rules_manager.get_rule_by_id('GIT02')
                 if rule:
-                    penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
+                    penalty = rule[penalty_key]
                     total_deductions += penalty
                     violations.append({
                         "file": f"commit {commit_hash}",
                         "rule": rule['name'],
                         "id": rule['id'],
                         "deduction": penalty,
-                        "desc": "Reverting a revert indicates chaos"
+                        "desc": "Reverting a revert indicates chaos",
+                        "line": None
                     })
             
-            # GIT03: Unprofessional commit
-            for keyword in unpro_keywords:
-                if keyword in message:
-                    rule = self.rules_manager.get_rule_by_id('GIT03')
-                    if rule:
-                        penalty = self.rules_manager.calculate_penalty(rule, brutal_mode)
-                        total_deductions += penalty
-                        violations.append({
-                            "file": f"commit {commit_hash}",
-                            "rule": rule['name'],
-                            "id": rule['id'],
-                            "deduction": penalty,
-                            "desc": f"Contains '{keyword}'"
-                        })
-                    break
+            # GIT03: Unprofessional commit. The regex only rejects clean messages
+            # fast; the description names the first keyword in list order
+            if _UNPRO_COMMIT_RE.search(message):
+                keyword = next(k for k in _UNPRO_KEYWORDS if k in message)
+                rule = self.rules_manager.get_rule_by_id('GIT03')
+                if rule:
+                    penalty = rule[penalty_key]
+                    total_deductions += penalty
+                    violations.append({
+                        "file": f"commit {commit_hash}",
+                        "rule": rule['name'],
+                        "id": rule['id'],
+                        "deduction": penalty,
+                        "desc": f"Contains '{keyword}'",
+                        "line": None
+                    })
         
         return violations, total_deductions
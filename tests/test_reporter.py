@@ -0,0 +1,165 @@
+"""
+Unit tests for Reporter
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.reporter import Reporter
+
+
+def _write_summary(violations, score=700, threshold=800):
+    """Render a job summary into a temp file and return its contents"""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
+        summary_file = f.name
+
+    previous = os.environ.get('GITHUB_STEP_SUMMARY')
+    os.environ['GITHUB_STEP_SUMMARY'] = summary_file
+    try:
+        Reporter().write_job_summary(
+            score=score,
+            threshold=threshold,
+            starting_score=1000,
+            violations=violations
+        )
+        with open(summary_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    finally:
+        if previous is None:
+            del os.environ['GITHUB_STEP_SUMMARY']
+        else:
+            os.environ['GITHUB_STEP_SUMMARY'] = previous
+        os.unlink(summary_file)
+
+
+def test_reporter_job_summary_groups_by_category():
+    """Test that the job summary groups violations and totals per category"""
+    violations = [
+        {'file': 'app.py', 'id': 'SEC04', 'rule': 'Hardcoded Password', 'deduction': 80, 'desc': 'x', 'line': 3},
+        {'file': 'db.py', 'id': 'SEC09', 'rule': 'Plain text password storage', 'deduction': 85, 'desc': 'x', 'line': 7},
+        {'file': 'commit abc1234', 'id': 'GIT01', 'rule': 'Lazy Commit Message', 'deduction': 15, 'desc': 'x', 'line': None},
+    ]
+
+    md = _write_summary(violations)
+
+    assert '## 📉 Violations Detected (3)' in md
+    assert '### 🔒 Security (-165 pts)' in md
+    assert '### 🌿 Git Hygiene (-15 pts)' in md
+    assert '| `app.py` | Hardcoded Password | L3 | -80 |' in md
+    assert '| `commit abc1234` | Lazy Commit Message | - | -15 |' in md
+    assert '**Status:** **FAILED**' in md
+
+
+def test_reporter_job_summary_truncates_rows():
+    """Test that each category lists at most 10 rows"""
+    violations = [
+        {'file': f'f{i}.py', 'id': 'STB03', 'rule': 'TODO in Code', 'deduction': 15, 'desc': 'x', 'line': i}
+        for i in range(1, 14)
+    ]
+
+    md = _write_summary(violations)
+
+    assert md.count('| TODO in Code |') == 10
+    assert '*3 more violations*' in md
+
+
+def test_reporter_job_summary_no_violations():
+    """Test the empty report"""
+    md = _write_summary([], score=1000)
+
+    assert 'No violations found!' in md
+    assert '**Status:** **PASSED**' in md
+
+
+def test_reporter_progress_bar_is_clamped():
+    """Test the progress bar stays 20 cells wide for out-of-range scores"""
+    assert '`-250/1000` ' + '░' * 20 + '  \n' in _write_summary([], score=-250)
+    assert '`1000/1000` ' + '█' * 20 + '  \n' in _write_summary([], score=1000)
+
+
+def test_reporter_accepts_violations_without_line():
+    """Test that violation dicts without a 'line' key still render"""
+    violation = {'file': 'app.py', 'id': 'SEC01', 'rule': 'Committed .env file', 'deduction': 100, 'desc': 'x'}
+
+    assert Reporter().format_github_annotation(violation, 'error') == \
+        '::error file=app.py::[SEC01] Committed .env file (-100 pts)'
+    assert '| `app.py` | Committed .env file | - | -100 |' in _write_summary([violation])
+
+
+def test_reporter_prints_or_queues_annotations():
+    """Test that print_github_annotation writes at once and queued ones wait for a flush"""
+    violation = {'file': 'app.js', 'id': 'HYG01', 'rule': 'Console Log', 'deduction': 5, 'desc': 'x', 'line': 4}
+    reporter = Reporter()
+
+    out = io.StringIO()
+    with redirect_stdout(out):
+        reporter.print_github_annotation(violation)
+        assert out.getvalue() == '::warning file=app.js,line=4::[HYG01] Console Log (-5 pts)\n'
+
+        reporter.queue_github_annotation(violation)
+        reporter.queue_github_annotation(violation, 'error')
+        assert out.getvalue().count('\n') == 1
+
+        reporter.flush_annotations()
+    assert out.getvalue().splitlines()[1:] == [
+        '::warning file=app.js,line=4::[HYG01] Console Log (-5 pts)',
+        '::error file=app.js,line=4::[HYG01] Console Log (-5 pts)',
+    ]
+
+
+def test_reporter_groups_mutated_list_afresh():
+    """Test that regrouping a list mutated in place reflects its new contents"""
+    reporter = Reporter()
+    violations = [{'file': 'a.py', 'id': 'SEC04', 'rule': 'Hardcoded Password', 'deduction': 80, 'desc': 'x', 'line': 1}]
+    assert [cat for cat, _, _ in reporter._group_by_category(violations)] == ['security']
+
+    violations[0] = {'file': 'a.js', 'id': 'HYG01', 'rule': 'Console Log', 'deduction': 5, 'desc': 'x', 'line': 2}
+    assert [(cat, total) for cat, _, total in reporter._group_by_category(violations)] == [('hygiene', 5)]
+
+
+def test_reporter_category_from_rule_id():
+    """Test rule ID prefix to category mapping"""
+    reporter = Reporter()
+
+    assert reporter._get_category_from_rule_id('SEC01') == 'security'
+    assert reporter._get_category_from_rule_id('GIT07') == 'git'
+    # Two-letter prefixes
+    assert reporter._get_category_from_rule_id('UX12') == 'ux'
+    assert reporter._get_category_from_rule_id('AI01') == 'ai_slop'
+    assert reporter._get_category_from_rule_id('ZZZ01') == 'other'
+
+
+if __name__ == '__main__':
+    print("Running Reporter tests...")
+
+    test_reporter_job_summary_groups_by_category()
+    print("✓ Category grouping test passed")
+
+    test_reporter_job_summary_truncates_rows()
+    print("✓ Row truncation test passed")
+
+    test_reporter_job_summary_no_violations()
+    print("✓ Empty report test passed")
+
+    test_reporter_progress_bar_is_clamped()
+    print("✓ Progress bar clamping test passed")
+
+    test_reporter_accepts_violations_without_line()
+    print("✓ Missing line test passed")
+
+    test_reporter_prints_or_queues_annotations()
+    print("✓ Annotation output test passed")
+
+    test_reporter_groups_mutated_list_afresh()
+    print("✓ Regrouping test passed")
+
+    test_reporter_category_from_rule_id()
+    print("✓ Category mapping test passed")
+
+    print("\n✅ All tests passed!")
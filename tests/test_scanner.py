@@ -4,13 +4,36 @@ Unit tests for CodeScanner
 
 import os
 import sys
+import subprocess
 import tempfile
+from concurrent.futures.process import BrokenProcessPool
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.rules import RulesManager
-from src.scanner import CodeScanner, Violation
+from src.scanner import CodeScanner, GitScanner, Violation, _count_lines, _prune_ast_cache
+
+
+_cache_home = None
+_previous_cache_home = None
+
+
+def setup_module(module=None):
+    """Point the AST cache at a temporary directory instead of the user's cache"""
+    global _cache_home, _previous_cache_home
+    _cache_home = tempfile.TemporaryDirectory()
+    _previous_cache_home = os.environ.get('XDG_CACHE_HOME')
+    os.environ['XDG_CACHE_HOME'] = _cache_home.name
+
+
+def teardown_module(module=None):
+    """Restore XDG_CACHE_HOME and remove the temporary cache"""
+    if _previous_cache_home is None:
+        os.environ.pop('XDG_CACHE_HOME', None)
+    else:
+        os.environ['XDG_CACHE_HOME'] = _previous_cache_home
+    _cache_home.cleanup()
 
 
 def test_violation_to_dict():
@@ -32,6 +55,10 @@ def test_violation_to_dict():
     assert result['deduction'] == 100
     assert result['desc'] == "Test description"
     assert result['line'] == 42
+    
+    # Line is always present, even when unknown
+    no_line = Violation("a.env", "SEC01", "Test Rule", 100, "Test description").to_dict()
+    assert no_line['line'] is None
 
 
 def test_scanner_is_excluded():
@@ -46,6 +73,43 @@ def test_scanner_is_excluded():
     assert scanner.is_excluded('src/main.py') == False
 
 
+def test_scanner_prunes_excluded_directories():
+    """Test that excluded directories are skipped without changing which files are scanned"""
+    rules_manager = RulesManager()
+    scanner = CodeScanner(rules_manager, exclude_patterns=['*/generated/*', 'docs$'])
+    
+    assert scanner._is_pruned(os.path.join('pkg', 'generated')) == True
+    # Anchored patterns could behave differently deeper down, so they never prune
+    assert scanner._is_pruned('docs') == False
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sub in ('src', os.path.join('src', 'generated'), 'docs'):
+            os.makedirs(os.path.join(tmp_dir, sub), exist_ok=True)
+            with open(os.path.join(tmp_dir, sub, 'mod.py'), 'w') as f:
+                f.write('x = 1\n')
+        
+        walked = list(scanner._walk_files(tmp_dir))
+        scanned = [p for p in walked if not scanner.is_excluded(p)]
+    
+    assert len(walked) == 2
+    assert sorted(os.path.basename(os.path.dirname(p)) for p in scanned) == ['docs', 'src']
+
+
+
+def test_scanner_skips_tool_caches_but_not_ide_dirs():
+    """Test that generated tool caches are skipped while .vscode/ is still walked for VCS07"""
+    scanner = CodeScanner(RulesManager())
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for sub in ('.mypy_cache', '.tox', '.vscode'):
+            os.makedirs(os.path.join(tmp_dir, sub))
+            with open(os.path.join(tmp_dir, sub, 'settings.json'), 'w') as f:
+                f.write('{}\n')
+        
+        walked = list(scanner._walk_files(tmp_dir))
+    
+    assert [os.path.basename(os.path.dirname(p)) for p in walked] == ['.vscode']
+
 def test_scanner_is_comment_line():
     """Test comment detection"""
     rules_manager = RulesManager()
@@ -115,6 +179,239 @@ def process_data(data):
     assert len(print_violations) > 0
 
 
+def test_scanner_ast_respects_ignored_rules():
+    """Test that AST checks skip rules ignored in configuration"""
+    rules_manager = RulesManager(ignore_rules={'SEC06'})
+    scanner = CodeScanner(rules_manager)
+    
+    violations = scanner.check_python_ast_violations('main.py', 'eval("1")\n')
+    
+    assert not [v for v in violations if v.rule_id == 'SEC06']
+    
+    # Rules ignored after construction (e.g. by load_config) behave the same
+    rules_manager = RulesManager()
+    rules_manager.ignore_rules = {'SEC06'}
+    violations = CodeScanner(rules_manager).check_python_ast_violations('main.py', 'eval("1")\n')
+    
+    assert not [v for v in violations if v.rule_id == 'SEC06']
+
+
+def test_scanner_runs_regex_rules_alongside_ast():
+    """Test that SEC06/HYG02 regexes still run on parseable Python files"""
+    scanner = CodeScanner(RulesManager())
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+        f.write('model.eval()\nhint = "never call eval(x)"\nresult = eval("1")\n')
+        temp_file = f.name
+    
+    try:
+        violations = scanner.scan_file(temp_file)
+    finally:
+        os.unlink(temp_file)
+    
+    sec06 = [(v.line, v.desc) for v in violations if v.rule_id == 'SEC06']
+    assert (3, 'Real eval() call detected via AST') in sec06
+    assert [line for line, desc in sec06 if desc != 'Real eval() call detected via AST'] == [1, 2, 3]
+
+
+def test_scanner_caches_python_calls():
+    """Test that parsed call sites are cached and reused across scans"""
+    rules_manager = RulesManager()
+    content = 'x = 1\nresult = eval("2")\n'
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        previous = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = tmp_dir
+        try:
+            first = CodeScanner(rules_manager).check_python_ast_violations('main.py', content)
+            cache_dir = os.path.join(tmp_dir, 'vibeguard', 'ast')
+            assert len(os.listdir(cache_dir)) == 1
+            
+            second = CodeScanner(rules_manager).check_python_ast_violations('main.py', content)
+            assert [v.to_dict() for v in second] == [v.to_dict() for v in first]
+            assert [(v.rule_id, v.line) for v in second] == [('SEC06', 2)]
+        finally:
+            if previous is None:
+                del os.environ['XDG_CACHE_HOME']
+            else:
+                os.environ['XDG_CACHE_HOME'] = previous
+
+
+def test_prune_ast_cache_keeps_recently_used_entries():
+    """Test that the AST cache is trimmed to its least recently used entries"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        previous = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = tmp_dir
+        try:
+            cache_dir = os.path.join(tmp_dir, 'vibeguard', 'ast')
+            os.makedirs(cache_dir)
+            for i in range(5):
+                path = os.path.join(cache_dir, f'{i}.json')
+                with open(path, 'w') as f:
+                    f.write('[]')
+                os.utime(path, (1000 + i, 1000 + i))
+            # A temporary file left by an interrupted write
+            with open(os.path.join(cache_dir, 'x.json.1.tmp'), 'w') as f:
+                f.write('[')
+            os.utime(os.path.join(cache_dir, 'x.json.1.tmp'), (1000, 1000))
+            
+            _prune_ast_cache(max_entries=2)
+            assert sorted(os.listdir(cache_dir)) == ['3.json', '4.json']
+        finally:
+            if previous is None:
+                del os.environ['XDG_CACHE_HOME']
+            else:
+                os.environ['XDG_CACHE_HOME'] = previous
+
+
+def test_count_lines_matches_splitlines():
+    """Test that the fast line count agrees with str.splitlines()"""
+    samples = ['', '\n', 'a', 'a\n', 'a\nb', 'a\n\nb\n', 'a\x0cb\n', 'a\u2028b']
+    for content in samples:
+        assert _count_lines(content) == len(content.splitlines()), repr(content)
+
+
+def test_scanner_reports_regex_line_numbers():
+    """Test that regex matches are mapped to the right line"""
+    rules_manager = RulesManager()
+    scanner = CodeScanner(rules_manager)
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+        f.write('let a = 1;\n\nconsole.log(a);\nlet b = 2;\nconsole.log(b);\n')
+        temp_file = f.name
+    
+    try:
+        violations = scanner.scan_file(temp_file)
+        lines = sorted(v.line for v in violations if v.rule_id == 'HYG01')
+        assert lines == [3, 5]
+    finally:
+        os.unlink(temp_file)
+
+
+def test_scanner_reports_rule_once_per_line():
+    """Test that several matches of one rule on a line count once"""
+    scanner = CodeScanner(RulesManager())
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+        f.write('console.log(1); console.log(2); console.log(3);\n'
+                'console.log(4); console.log(5);\n'
+                'console.log(6);\n'
+                'console.log(7);\n')
+        temp_file = f.name
+    
+    try:
+        violations = scanner.scan_file(temp_file)
+        lines = [v.line for v in violations if v.rule_id == 'HYG01']
+        # Repeats on a line must not use up the 3-line cap
+        assert lines == [1, 2, 3]
+    finally:
+        os.unlink(temp_file)
+
+
+def test_scanner_cap_counts_comment_lines():
+    """Test that matches on comment lines still use up the 3-line cap"""
+    scanner = CodeScanner(RulesManager())
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+        f.write('// console.log(1);\n'
+                '// console.log(2);\n'
+                'console.log(3);\n'
+                'console.log(4);\n')
+        temp_file = f.name
+    
+    try:
+        violations = scanner.scan_file(temp_file)
+        lines = [v.line for v in violations if v.rule_id == 'HYG01']
+        assert lines == [3]
+    finally:
+        os.unlink(temp_file)
+
+
+def test_scanner_parallel_matches_serial():
+    """Test that a process-pool scan reports the same results as a serial scan"""
+    rules_manager = RulesManager()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(40):
+            with open(os.path.join(tmp_dir, f'module_{i}.py'), 'w') as f:
+                f.write(f'password = "secret{i}"\nresult = eval("{i}")\n')
+        
+        serial = CodeScanner(rules_manager, workers=1)
+        parallel = CodeScanner(rules_manager, workers=2)
+        
+        serial_results = [v.to_dict() for v in serial.scan_directory(tmp_dir)]
+        parallel_results = [v.to_dict() for v in parallel.scan_directory(tmp_dir)]
+    
+    assert len(serial_results) > 0
+    assert parallel_results == serial_results
+    assert parallel.files_scanned == serial.files_scanned == 40
+
+
+
+def test_scanner_falls_back_when_pool_breaks():
+    """Test that a pool whose workers die is replaced by a serial scan"""
+    rules_manager = RulesManager()
+    
+    def broken_pool(filepaths, brutal_mode):
+        raise BrokenProcessPool("worker died")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(40):
+            with open(os.path.join(tmp_dir, f'module_{i}.py'), 'w') as f:
+                f.write(f'password = "secret{i}"\n')
+        
+        scanner = CodeScanner(rules_manager, workers=2)
+        scanner._scan_parallel = broken_pool
+        violations = scanner.scan_directory(tmp_dir)
+    
+    assert len(violations) > 0
+    assert scanner.files_scanned == 40
+
+def test_git_scanner_flags_lazy_and_unprofessional_commits():
+    """Test GIT01/GIT03 detection on raw commit log lines"""
+    git_scanner = GitScanner(RulesManager())
+    commits = [
+        'a1b2c3d4e5|dev|2024-01-01|WIP',
+        'b2c3d4e5f6|dev|2024-01-02|.',
+        'c3d4e5f6a7|dev|2024-01-03|fix lol hope this works',
+        'd4e5f6a7b8|dev|2024-01-04|Add parser for config files',
+        # Several keywords: named in list order, not by position in the message
+        'e5f6a7b8c9|dev|2024-01-05|idk, oops',
+    ]
+    
+    violations, total = git_scanner._analyze_commits(commits, brutal_mode=False)
+    found = [(v['file'], v['id'], v['desc']) for v in violations]
+    
+    assert ('commit a1b2c3d', 'GIT01', "'wip' provides zero context") in found
+    assert ('commit b2c3d4e', 'GIT01', "'.' provides zero context") in found
+    assert ('commit c3d4e5f', 'GIT03', "Contains 'lol'") in found
+    assert ('commit e5f6a7b', 'GIT03', "Contains 'oops'") in found
+    assert not any(v['file'] == 'commit d4e5f6a' for v in violations)
+    assert total == sum(v['deduction'] for v in violations)
+
+
+
+def test_git_scanner_reaps_unused_prefetch():
+    """Test that a prefetched git log nobody collects is killed and reaped"""
+    def sleeper():
+        return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    
+    git_scanner = GitScanner(RulesManager())
+    process = sleeper()
+    git_scanner._prefetched = (50, process)
+    git_scanner.cancel_prefetch()
+    
+    assert process.returncode is not None
+    assert git_scanner._prefetched is None
+    
+    # A prefetch for another commit_limit is reaped before a new git log starts
+    stale = sleeper()
+    git_scanner._prefetched = (50, stale)
+    git_scanner.scan_history(commit_limit=5)
+    
+    assert stale.returncode is not None
+
 def test_scanner_respects_ignore_comments():
     """Test that scanner respects vibeguard:ignore comments"""
     rules_manager = RulesManager()
@@ -141,6 +438,7 @@ api_key = "should_be_ignored"  # vibeguard:ignore
 
 if __name__ == '__main__':
     print("Running CodeScanner tests...")
+    setup_module()
     
     test_violation_to_dict()
     print("✓ Violation serialization test passed")
@@ -148,6 +446,12 @@ if __name__ == '__main__':
     test_scanner_is_excluded()
     print("✓ File exclusion test passed")
     
+    test_scanner_prunes_excluded_directories()
+    print("✓ Directory pruning test passed")
+    
+    test_scanner_skips_tool_caches_but_not_ide_dirs()
+    print("✓ Tool cache skipping test passed")
+    
     test_scanner_is_comment_line()
     print("✓ Comment detection test passed")
     
@@ -157,7 +461,44 @@ if __name__ == '__main__':
     test_scanner_detects_python_ast_violations()
     print("✓ AST violation detection test passed")
     
+    test_scanner_ast_respects_ignored_rules()
+    print("✓ AST ignored rules test passed")
+    
+    test_scanner_runs_regex_rules_alongside_ast()
+    print("✓ AST and regex rules test passed")
+    
+    test_scanner_caches_python_calls()
+    print("✓ AST cache test passed")
+    
+    test_prune_ast_cache_keeps_recently_used_entries()
+    print("✓ AST cache pruning test passed")
+    
+    test_count_lines_matches_splitlines()
+    print("✓ Line count test passed")
+    
+    test_scanner_reports_regex_line_numbers()
+    print("✓ Regex line number test passed")
+    
+    test_scanner_reports_rule_once_per_line()
+    print("✓ Per-line dedup test passed")
+    
+    test_scanner_cap_counts_comment_lines()
+    print("✓ Comment lines cap test passed")
+    
+    test_scanner_parallel_matches_serial()
+    print("✓ Parallel scan test passed")
+    
+    test_scanner_falls_back_when_pool_breaks()
+    print("✓ Broken pool fallback test passed")
+    
+    test_git_scanner_flags_lazy_and_unprofessional_commits()
+    print("✓ Git commit message test passed")
+    
+    test_git_scanner_reaps_unused_prefetch()
+    print("✓ Git prefetch cleanup test passed")
+    
     test_scanner_respects_ignore_comments()
     print("✓ Ignore comment respect test passed")
     
+    teardown_module()
     print("\n✅ All tests passed!")
@@ -10,7 +10,7 @@ Refactored for maintainability with modular design
 import os
 import sys
 import argparse
-import json
+import functools
 from typing import Tuple, List, Dict, Any
 
 # Add src to path
@@ -21,34 +21,79 @@ from scanner import CodeScanner, GitScanner
 from reporter import Reporter
 from logger import create_logger
 
+# orjson is an optional speedup for config parsing
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 
 STARTING_SCORE = 1000
 DEFAULT_THRESHOLD = 800
 
+# Console header pieces
+_SEPARATOR = "=" * 50
+_MODE_BRUTAL = "🔥 BRUTAL MODE"
+_MODE_STANDARD = "Standard Mode"
+
+# GitHub Actions inputs, read once at import (see reload_env)
+_ENV_THRESHOLD = os.environ.get("INPUT_THRESHOLD")
+_ENV_BRUTAL_MODE = os.environ.get("INPUT_BRUTAL_MODE", "false").lower() == "true"
+
+
+def reload_env() -> None:
+    """Re-read the GitHub Actions INPUT_* variables (e.g. after a test changes them)"""
+    global _ENV_THRESHOLD, _ENV_BRUTAL_MODE
+    _ENV_THRESHOLD = os.environ.get("INPUT_THRESHOLD")
+    _ENV_BRUTAL_MODE = os.environ.get("INPUT_BRUTAL_MODE", "false").lower() == "true"
 
-def load_config(config_path: str = '.vibeguardrc') -> Tuple[List[str], List[str]]:
+
+def load_config(config_path: str = '.vibeguardrc') -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
     """
     Load user configuration
     
+    Parsed configs are cached per (path, mtime, size), so repeated calls
+    in one process only re-read the file after it changes.
+    
     Args:
         config_path: Path to configuration file
     
+    Returns:
+        Tuple of (ignore_rules, exclude_patterns)
+    """
+    try:
+        stat = os.stat(config_path)
+    except OSError:
+        return (), ()
+    
+    return _load_config_cached(config_path, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config_cached(config_path: str, mtime_ns: int, size: int) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Read and parse a configuration file (cached by load_config)
+    
+    Args:
+        config_path: Path to configuration file
+        mtime_ns: File modification time, part of the cache key
+        size: File size, part of the cache key
+    
     Returns:
         Tuple of (ignore_rules, exclude_patterns)
     """
     ignore_rules = []
     exclude_patterns = []
     
-    if os.path.exists(config_path):
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                ignore_rules = config.get('ignore', [])
-                exclude_patterns = config.get('exclude_files', [])
-        except Exception as e:
-            print(f"⚠️  Failed to load {config_path}: {e}")
+    try:
+        with open(config_path, 'rb') as f:
+            config = _json.loads(f.read())
+            ignore_rules = config.get('ignore', [])
+            exclude_patterns = config.get('exclude_files', [])
+    except Exception as e:
+        print(f"⚠️  Failed to load {config_path}: {e}")
     
-    return ignore_rules, exclude_patterns
+    return tuple(ignore_rules), tuple(exclude_patterns)
 
 
 def parse_args() -> argparse.Namespace:
@@ -68,6 +113,7 @@ Examples:
   %(prog)s --brutal-mode            # Enable brutal mode (double penalties)
   %(prog)s --verbose                # Show detailed logging
   %(prog)s --config custom.json     # Use custom config file
+  %(prog)s --workers 1              # Scan files in a single process
   
 Exit codes:
   0: Success (score >= threshold)
@@ -124,6 +170,14 @@ Exit codes:
         help='Skip git history audit'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Worker processes for file scanning (1 scans serially). Default: CPU count'
+    )
+    
     parser.add_argument(
         '--directory',
         type=str,
@@ -148,14 +202,16 @@ def get_config_from_env_or_args(args: argparse.Namespace) -> Tuple[int, bool]:
     # Threshold: CLI arg > env var > default
     if args.threshold is not None:
         threshold = args.threshold
+    elif _ENV_THRESHOLD is not None:
+        threshold = int(_ENV_THRESHOLD)
     else:
-        threshold = int(os.environ.get("INPUT_THRESHOLD", DEFAULT_THRESHOLD))
+        threshold = DEFAULT_THRESHOLD
     
     # Brutal mode: CLI arg > env var > default
     if args.brutal_mode is not None:
         brutal_mode = args.brutal_mode
     else:
-        brutal_mode = os.environ.get("INPUT_BRUTAL_MODE", "false").lower() == "true"
+        brutal_mode = _ENV_BRUTAL_MODE
     
     return threshold, brutal_mode
 
@@ -178,31 +234,26 @@ def main() -> int:
     
     # Print header
     logger.info("🛡️  VibeGuard Auditor v1.4.0")
-    logger.info("=" * 50)
+    logger.info(_SEPARATOR)
     
-    mode_indicator = "🔥 BRUTAL MODE" if brutal_mode else "Standard Mode"
+    mode_indicator = _MODE_BRUTAL if brutal_mode else _MODE_STANDARD
     logger.group_start(f"🔍 Starting VibeGuard Scan ({mode_indicator}, Threshold: {threshold})")
     logger.info(f"Starting Score: {STARTING_SCORE}")
     logger.info(f"Target Threshold: {threshold}")
     
     # Initialize components
     try:
-        rules_manager = RulesManager(rules_path=args.rules)
-        rules_manager.ignore_rules = set(ignore_rules)
+        rules_manager = RulesManager(rules_path=args.rules, ignore_rules=set(ignore_rules))
         
-        logger.info(f"Active Rules: {len(rules_manager.get_active_rules())}/{len(rules_manager)}")
+        logger.info(f"Active Rules: {len(rules_manager.get_active_rules())}/{rules_manager.total_rules}")
         if ignore_rules:
             logger.info(f"Ignored Rules: {', '.join(sorted(ignore_rules))}")
         
         code_scanner = CodeScanner(
             rules_manager=rules_manager,
             exclude_patterns=exclude_patterns,
-            logger=logger
-        )
-        
-        git_scanner = GitScanner(
-            rules_manager=rules_manager,
-            logger=logger
+            logger=logger,
+            workers=args.workers
         )
         
         reporter = Reporter(logger=logger)
@@ -218,69 +269,95 @@ def main() -> int:
     score = STARTING_SCORE
     violations = []
     
+    # Resolved once; brutal mode checks every file violation against it
+    critical_ids = frozenset(r['id'] for r in rules_manager.get_critical_rules())
+    rule_level = rules_manager.rule_level
+    
+    # Start reading the git log now so it overlaps with the file scan
+    git_scanner = None
+    if not args.no_git:
+        try:
+            git_scanner = GitScanner(
+                rules_manager=rules_manager,
+                logger=logger
+            )
+            git_scanner.prefetch_history(commit_limit=50)
+        except Exception as e:
+            logger.debug(f"Git history prefetch unavailable: {e}")
+    
     try:
-        # Scan code files
-        file_violations = code_scanner.scan_directory(
-            root_dir=args.directory,
-            brutal_mode=brutal_mode
-        )
-        
-        # Convert Violation objects to dictionaries
-        for violation in file_violations:
-            v_dict = violation.to_dict()
-            violations.append(v_dict)
-            score -= violation.deduction
-            
-            # Print GitHub annotation
-            if violation.rule_id.startswith(('SEC', 'AI', 'VCS01')):
-                reporter.print_github_annotation(v_dict, level="error")
-            else:
-                reporter.print_github_annotation(v_dict, level="warning")
+        try:
+            # Scan code files
+            file_violations = code_scanner.scan_directory(
+                root_dir=args.directory,
+                brutal_mode=brutal_mode
+            )
             
-            # Brutal mode: fail fast on critical violations
-            if brutal_mode:
-                rule = rules_manager.get_rule_by_id(violation.rule_id)
-                if rule and rule.get('critical', False):
+            # Convert Violation objects to dictionaries
+            for violation in file_violations:
+                v_dict = violation.to_dict()
+                violations.append(v_dict)
+                score -= violation.deduction
+                
+                # Queue GitHub annotation (flushed in one write below)
+                reporter.queue_github_annotation(v_dict, level=rule_level[violation.rule_id])
+                
+                # Brutal mode: fail fast on critical violations
+                if brutal_mode and violation.rule_id in critical_ids:
+                    reporter.flush_annotations()
                     logger.critical("BRUTAL MODE: Critical violation detected. Terminating immediately.")
                     logger.critical(f"Rule {violation.rule_id}: {violation.rule_name} in {violation.file}")
                     logger.group_end()
                     return 1
-        
-        logger.info(f"Files Scanned: {code_scanner.files_scanned}")
-        logger.info(f"File Violations: {len(file_violations)}")
-        logger.info(f"File Deductions: -{STARTING_SCORE - score} pts")
-        
-    except Exception as e:
-        logger.error(f"File scanning failed: {e}")
-        logger.group_end()
-        return 1
-    
-    logger.group_end()
-    
-    # Scan git history
-    if not args.no_git:
-        logger.group_start("🌿 Auditing Git History (Last 50 Commits)")
-        
-        try:
-            git_deductions, git_violations = git_scanner.scan_history(
-                brutal_mode=brutal_mode,
-                commit_limit=50
-            )
             
-            score -= git_deductions
-            violations.extend(git_violations)
+            reporter.flush_annotations()
             
-            # Print git violations as warnings
-            for v in git_violations:
-                reporter.print_github_annotation(v, level="warning")
+            logger.info(f"Files Scanned: {code_scanner.files_scanned}")
+            logger.info(f"File Violations: {len(file_violations)}")
+            logger.info(f"File Deductions: -{STARTING_SCORE - score} pts")
             
-            logger.info(f"Git Deductions: -{git_deductions} pts")
-            logger.info(f"Git Violations: {len(git_violations)}")
-        
         except Exception as e:
-            logger.warning(f"Git history scan failed: {e}")
+            reporter.flush_annotations()
+            logger.error(f"File scanning failed: {e}")
+            logger.group_end()
+            return 1
         
         logger.group_end()
+        
+        # Scan git history
+        if not args.no_git:
+            logger.group_start("🌿 Auditing Git History (Last 50 Commits)")
+            
+            try:
+                if git_scanner is None:
+                    git_scanner = GitScanner(
+                        rules_manager=rules_manager,
+                        logger=logger
+                    )
+                git_deductions, git_violations = git_scanner.scan_history(
+                    brutal_mode=brutal_mode,
+                    commit_limit=50
+                )
+                
+                score -= git_deductions
+                violations.extend(git_violations)
+                
+                # Print git violations as warnings
+                for v in git_violations:
+                    reporter.queue_github_annotation(v, level="warning")
+                reporter.flush_annotations()
+                
+                logger.info(f"Git Deductions: -{git_deductions} pts")
+                logger.info(f"Git Violations: {len(git_violations)}")
+            
+            except Exception as e:
+                logger.warning(f"Git history scan failed: {e}")
+            
+            logger.group_end()
+    finally:
+        # Never leave the prefetched git log running (early returns, errors)
+        if git_scanner is not None:
+            git_scanner.cancel_prefetch()
     
     # Print summary
     logger.info("")
@@ -8,35 +8,36 @@ Designed for GitHub Actions with native annotations and job summaries
 import os
 import re
 import sys
-import json
 import ast
 import subprocess
-from datetime import datetime
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+# google-re2 (opzionale): prefiltro lineare su tutte le regex in un solo passaggio
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 # Leggiamo gli input dall'ambiente (passati da action.yml)
 INPUT_THRESHOLD = int(os.environ.get("INPUT_THRESHOLD", 800))
 INPUT_BRUTAL_MODE = os.environ.get("INPUT_BRUTAL_MODE", "false").lower() == "true"
+PENALTY_MULTIPLIER = 2 if INPUT_BRUTAL_MODE else 1  # brutal mode raddoppia ogni penalità
 STARTING_SCORE = 1000
+PARALLEL_MIN_FILES = 32  # sotto questa soglia il pool costa più di quanto rende
+# Opzionale: ferma la scansione appena il punteggio scende sotto la soglia (esito già deciso)
+FAIL_FAST = os.environ.get("VIBEGUARD_FAIL_FAST", "0") == "1"
 
-# Carica config personalizzata se esiste
+# Config personalizzata (.vibeguardrc): la legge main() con load_config(), non l'import,
+# così i worker del pool (spawn/forkserver rieseguono il modulo) non la rileggono né ristampano
 IGNORE_RULES = set()
 EXCLUDE_PATTERNS = []
 
-if os.path.exists(".vibeguardrc"):
-    try:
-        with open(".vibeguardrc", "r") as f:
-            config = json.load(f)
-            IGNORE_RULES = set(config.get("ignore", []))
-            EXCLUDE_PATTERNS = config.get("exclude_files", [])
-            print(f"📝 Loaded .vibeguardrc: Ignoring {len(IGNORE_RULES)} rules, {len(EXCLUDE_PATTERNS)} patterns")
-    except Exception as e:
-        print(f"⚠️  Failed to load .vibeguardrc: {e}")
-
 # 300+ SOTA Rules: Anti-Vibecoding Patterns from Code Quality + UI/UX + Documentation
 RULES = [
     # ========== SECURITY (Critical - 60-100 pts) ==========
     {"id": "SEC01", "name": "Committed .env file", "pattern": r"^\.env$", "weight": 100, "type": "filename", "desc": "Security risk: exposed secrets", "critical": True},
-    {"id": "SEC02", "name": "AWS Access Key Pattern", "pattern": r"(?<![A-Z0-9])[A-Z0-9]{20}(?![A-Z0-9])", "weight": 100, "type": "regex", "desc": "Possible hardcoded AWS credential"},
+    {"id": "SEC02", "name": "AWS Access Key Pattern", "pattern": r"\b(?:AKIA|ASIA|AROA|AIDA|ANPA|ANVA)[A-Z0-9]{16}\b", "weight": 100, "type": "regex", "desc": "Possible hardcoded AWS credential"},
     {"id": "SEC03", "name": "Private Key File", "pattern": r"\.(pem|key|p12|pfx)$", "weight": 100, "type": "filename", "desc": "Private key should not be committed"},
     {"id": "SEC04", "name": "Hardcoded Password", "pattern": r"password\s*=\s*['\"][^'\"]{3,}['\"]", "weight": 80, "type": "regex", "desc": "Hardcoded credential"},
     {"id": "SEC05", "name": "API Key Pattern", "pattern": r"(api[_-]?key|apikey)\s*=\s*['\"][^'\"]{10,}['\"]", "weight": 80, "type": "regex", "desc": "Hardcoded API key"},
@@ -160,7 +161,7 @@ RULES = [
     # ========== AI SLOP DETECTION (Critical - 100-500 pts) ==========
     {"id": "AI01", "name": "Committed AI Response", "pattern": r"As an AI language model", "weight": 500, "type": "regex", "desc": "Literally copy-pasted ChatGPT", "critical": True},
     {"id": "AI02", "name": "AI Preamble in Code", "pattern": r"(Here is the code you asked for|Here's a solution|I'll help you)", "weight": 200, "type": "regex", "desc": "AI-generated without review", "critical": True},
-    {"id": "AI03", "name": "Hallucinated Comment", "pattern": r"(//|#).*\(Note: this is a simplified)", "weight": 100, "type": "regex", "desc": "AI disclaimer in production"},
+    {"id": "AI03", "name": "Hallucinated Comment", "pattern": r"(//|#).*\(Note: this is a simplified\)", "weight": 100, "type": "regex", "desc": "AI disclaimer in production"},
     {"id": "AI04", "name": "Lorem Ipsum in Production", "pattern": r"Lorem ipsum dolor", "weight": 80, "type": "regex", "desc": "Placeholder text shipped"},
     
     # ========== REACT ANTI-PATTERNS (High - 30-60 pts) ==========
@@ -181,50 +182,431 @@ RULES = [
     {"id": "GIT07", "name": "Missing Ticket ID", "weight": 12, "type": "git", "desc": "No issue reference in commit"},
 ]
 
-IGNORE_DIRS = {'.git', '.github', 'node_modules', 'dist', 'build', 'venv', '__pycache__', '.venv', 'vendor'}
-IGNORE_FILES = {'package-lock.json', 'yarn.lock', 'poetry.lock', 'Cargo.lock', 'go.sum'}
+# Categoria del Job Summary (SEC, STB, MNT, ...), calcolata una volta per regola
+for _r in RULES:
+    _r['category'] = _r['id'][:3]
+RULE_CATEGORY = {_r['id']: _r['category'] for _r in RULES}
+RULES_BY_ID = {_r['id']: _r for _r in RULES}
+
+# Precompila i pattern una volta sola (regex di contenuto: multiline + case-insensitive)
+for _r in RULES:
+    if 'pattern' in _r:
+        _r['compiled'] = re.compile(_r['pattern'], (re.MULTILINE | re.IGNORECASE) if _r['type'] == 'regex' else 0)
+        # Gemello re.ASCII per i file di solo testo ASCII (stessi match, più veloce)
+        if _r['type'] == 'regex':
+            _r['compiled_ascii'] = re.compile(_r['pattern'], re.MULTILINE | re.IGNORECASE | re.ASCII)
+
+# Regole attive raggruppate per tipo: ogni controllo scorre solo la sua lista (vedi apply_config)
+def _active_rules(rule_type):
+    return [r for r in RULES if r['type'] == rule_type and r['id'] not in IGNORE_RULES]
+
+# Pattern filename/path che equivalgono a semplici confronti di stringhe
+# (nomi e percorsi non contengono \n, quindi $ è la fine della stringa)
+NAME_TESTS = {
+    r"^\.env$": lambda name: name == '.env',
+    r"\.(pem|key|p12|pfx)$": lambda name: name.endswith(('.pem', '.key', '.p12', '.pfx')),
+    r"(utils|helpers|common)\.js$": lambda name: name.endswith(('utils.js', 'helpers.js', 'common.js')),
+    r"\s": lambda name: name.split() != [name],
+    r"\.DS_Store$": lambda name: name.endswith('.DS_Store'),
+    r"\.(exe|dmg|zip|tar\.gz)$": lambda name: name.endswith(('.exe', '.dmg', '.zip', '.tar.gz')),
+    r"node_modules/": lambda path: 'node_modules/' in path,
+    r"__pycache__": lambda path: '__pycache__' in path,
+    r"\.(vscode|idea)/": lambda path: '.vscode/' in path or '.idea/' in path,
+}
+for _r in RULES:
+    if _r['type'] in ('filename', 'path'):
+        _r['test'] = NAME_TESTS.get(_r['pattern'], _r['compiled'].search)
+
+# Prefisso letterale obbligatorio di ogni regex (es. "console.log(" per HYG01):
+# senza re2, un file ASCII che non lo contiene salta la regola senza passare da re.
+def leading_literal(pattern):
+    """Prefisso letterale (minuscolo) che ogni match deve contenere, '' se non c'è"""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            i += 1
+        elif in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '(':
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return ''  # alternanza al primo livello: nessun prefisso comune
+        i += 1
+
+    literal = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        step = 1
+        if c == '^' and not literal:
+            i += 1
+            continue
+        if c == '\\':
+            nxt = pattern[i + 1:i + 2]
+            if nxt == 'b' and not literal:
+                i += 2
+                continue
+            if not nxt or nxt.isalnum():
+                break
+            c = nxt
+            step = 2
+        elif c in '.^$*+?{}[]|()':
+            break
+        quantifier = pattern[i + step:i + step + 1]
+        if quantifier in ('?', '*', '{'):
+            break
+        literal.append(c)
+        if quantifier == '+':
+            break
+        i += step
+    return ''.join(literal).lower()
+
+# Tabelle costruite su tutte le regex, attive o no: non dipendono dalla config
+ALL_REGEX_RULES = [r for r in RULES if r['type'] == 'regex']
+
+for _r in ALL_REGEX_RULES:
+    _lit = leading_literal(_r['pattern'])
+    _r['literal'] = _lit if len(_lit) >= 3 else ''
+
+# Con re2 disponibile, le regex di contenuto finiscono in un unico RE2::Set:
+# un file viene passato a `re` solo per le regole che il Set segnala.
+# Le regole che re2 non supporta (lookaround) hanno indice None e girano sempre.
+REGEX_SET = None
+REGEX_SET_INDEX = {}
+if re2 is not None:
+    _opts = re2.Options()
+    _opts.log_errors = False
+    _set = re2.Set.SearchSet(_opts)
+    for _r in ALL_REGEX_RULES:
+        try:
+            REGEX_SET_INDEX[_r['id']] = _set.Add('(?im)' + _r['pattern'])
+        except re2.error:
+            REGEX_SET_INDEX[_r['id']] = None
+    if any(i is not None for i in REGEX_SET_INDEX.values()):
+        _set.Compile()
+        REGEX_SET = _set
+
+NEWLINE_RE = re.compile(r'\n')
+# Separatori di riga di str.splitlines() oltre a \n (\r non arriva: file aperti in modalità testo)
+EXTRA_LINE_BREAK_RE = re.compile('[\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+# Caratteri su cui \s, \w e IGNORECASE Unicode differiscono da re.ASCII
+UNICODE_SENSITIVE_RE = re.compile('[^\x00-\x1b\x20-\x7f]')
+
+# Le cache degli strumenti (.pytest_cache, .mypy_cache, ...) contengono solo file generati.
+# Non si scartano tutte le directory nascoste: VCS07 deve vedere .vscode/ e .idea/
+IGNORE_DIRS = frozenset({'.git', '.github', 'node_modules', 'dist', 'build', 'venv', '__pycache__', '.venv', 'vendor',
+                         '.pytest_cache', '.mypy_cache', '.ruff_cache', '.tox', '.nox'})
+IGNORE_FILES = frozenset({'package-lock.json', 'yarn.lock', 'poetry.lock', 'Cargo.lock', 'go.sum'})
+TEXT_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.java', '.c', '.cpp', '.h',
+                             '.rb', '.php', '.html', '.css', '.scss', '.sass', '.vue', '.svelte',
+                             '.md', '.txt', '.yml', '.yaml', '.json', '.xml', '.sh', '.bash'})
+# Contenuto non analizzato: bundle minificati e file oltre 1MB (quasi sempre generati)
+MINIFIED_SUFFIXES = ('.min.js', '.min.css')
+MAX_FILE_SIZE = 1024 * 1024
+
+def count_lines(content):
+    """Come len(content.splitlines()), senza costruire la lista delle righe"""
+    if EXTRA_LINE_BREAK_RE.search(content):
+        return len(content.splitlines())
+    count = content.count('\n')
+    if content and not content.endswith('\n'):
+        count += 1
+    return count
+
+def count_file_lines(filepath):
+    """Righe di un file letto in binario a blocchi, senza decodificarlo (per i file oltre MAX_FILE_SIZE)"""
+    count = 0
+    last = b''
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            count += block.count(b'\n')
+            last = block[-1:]
+    if last and last != b'\n':
+        count += 1
+    return count
+
+def check_line_count(filepath, line_count, violations, out):
+    """Applica le regole 'lines' (MNT01); restituisce le deduzioni"""
+    deductions = 0
+    for r in LINE_RULES:
+        if line_count > r.get('max', float('inf')):
+            penalty = r['weight'] * PENALTY_MULTIPLIER
+            deductions += penalty
+            violations.append({
+                "file": filepath, 
+                "rule": f"{r['name']} ({line_count} lines)", 
+                "id": r['id'],
+                "deduction": penalty,
+                "desc": r['desc']
+            })
+            out.append(f"::warning file={filepath}::[{r['id']}] File has {line_count} lines (-{penalty} pts)")
+    return deductions
+
+def walk_files():
+    """
+    Elenca i file del repository come (nome, percorso relativo) con os.scandir,
+    nello stesso ordine di os.walk("."): le directory ignorate si scartano per
+    nome e il tipo arriva dal DirEntry, senza stat né relpath per ogni file.
+    """
+    stack = ['']
+    while stack:
+        prefix = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(prefix or '.') as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Come os.walk: i link simbolici a directory non vengono seguiti
+                        if entry.name not in IGNORE_DIRS and not entry.is_symlink():
+                            subdirs.append(prefix + entry.name + os.sep)
+                    elif entry.name not in IGNORE_FILES:
+                        yield entry.name, prefix + entry.name
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+def apply_config(ignore_rules, exclude_patterns):
+    """
+    Attiva regole ignorate e pattern di esclusione: ricostruisce le liste di regole
+    attive e le regex di esclusione. Gira anche come initializer dei worker del pool.
+    """
+    global IGNORE_RULES, EXCLUDE_PATTERNS, EXCLUDE_RES
+    global FILENAME_RULES, PATH_RULES, LINE_RULES, EOF_RULES, REGEX_RULES
+    IGNORE_RULES = set(ignore_rules)
+    EXCLUDE_PATTERNS = list(exclude_patterns)
+    # Compilati una volta sola (uno per uno: un'alternanza romperebbe
+    # i flag inline come (?i) e la numerazione dei backreference)
+    EXCLUDE_RES = [re.compile(pattern.replace('*', '.*')) for pattern in EXCLUDE_PATTERNS]
+    FILENAME_RULES = _active_rules('filename')
+    PATH_RULES = _active_rules('path')
+    LINE_RULES = _active_rules('lines')
+    EOF_RULES = _active_rules('eof')
+    REGEX_RULES = _active_rules('regex')
+
+apply_config(IGNORE_RULES, EXCLUDE_PATTERNS)  # nessuna config finché main() non la carica
+
+def load_config():
+    """Carica .vibeguardrc se esiste e lo applica"""
+    if not os.path.exists(".vibeguardrc"):
+        return
+    import json  # serve solo per la config
+    try:
+        with open(".vibeguardrc", "r") as f:
+            config = json.load(f)
+            ignore_rules = set(config.get("ignore", []))
+            exclude_patterns = config.get("exclude_files", [])
+    except Exception as e:
+        print(f"⚠️  Failed to load .vibeguardrc: {e}")
+        return
+    apply_config(ignore_rules, exclude_patterns)
+    print(f"📝 Loaded .vibeguardrc: Ignoring {len(IGNORE_RULES)} rules, {len(EXCLUDE_PATTERNS)} patterns")
 
 def is_excluded(filepath):
     """Check if file matches exclusion patterns from config"""
-    for pattern in EXCLUDE_PATTERNS:
-        if re.match(pattern.replace('*', '.*'), filepath):
+    for pattern in EXCLUDE_RES:
+        if pattern.match(filepath):
             return True
     return False
 
+# Prefissi di commento di riga per estensione (le altre non hanno commenti riconosciuti)
+COMMENT_PREFIXES = {
+    **dict.fromkeys(('.py', '.sh', '.bash', '.yml', '.yaml'), ('#',)),
+    **dict.fromkeys(('.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.go'), ('//', '*')),
+}
+
+# Regole che valgono anche sulle righe di commento
+COMMENT_EXEMPT_IDS = frozenset(r['id'] for r in RULES if r['id'].startswith(('DOC', 'STB03', 'STB04', 'STB05')))
+
 def is_comment_line(line, file_ext):
     """Detect if a line is a comment based on file type"""
-    stripped = line.strip()
-    if file_ext in ['.py', '.sh', '.bash', '.yml', '.yaml']:
-        return stripped.startswith('#')
-    elif file_ext in ['.js', '.ts', '.jsx', '.tsx', '.java', '.c', '.cpp', '.go']:
-        return stripped.startswith('//') or stripped.startswith('*')
-    return False
+    return line.lstrip().startswith(COMMENT_PREFIXES.get(file_ext, ()))
 
-def check_python_ast_violations(filepath, content):
-    """Use AST to detect Python-specific violations (reduces false positives)"""
-    violations = []
+# MNT04 e MNT06 hanno code [\s\S]{N,} che il motore ripercorre per ogni
+# intestazione class/function (quadratico sui file grandi). Queste funzioni
+# danno gli stessi inizi di match di finditer in tempo lineare.
+_FLAGS = re.MULTILINE | re.IGNORECASE
+CLASS_START_RE = {a: re.compile(r"class(?=\s+\w)", _FLAGS | (re.ASCII if a else 0)) for a in (False, True)}
+CLASS_HEADER_RE = {a: re.compile(r"class\s+\w+(\s*)", _FLAGS | (re.ASCII if a else 0)) for a in (False, True)}
+FUNCTION_HEADER_RE = {a: re.compile(r"function\s+\w+\s*\([^)]*\)\s*\{", _FLAGS | (re.ASCII if a else 0)) for a in (False, True)}
+
+def god_object_starts(content, ascii_only=False):
+    """Inizi dei match di MNT04: class\\s+\\w+\\s*.*\\{[\\s\\S]{5000,}?\\n\\}"""
+    closers = [m.start() for m in re.finditer(r"\n\}", content)]
+    if not closers:
+        return
+    pos = 0
+    for m in CLASS_START_RE[ascii_only].finditer(content):
+        if m.start() < pos:
+            continue
+        header = CLASS_HEADER_RE[ascii_only].match(content, m.start())
+        name_end, ws_end = header.span(1)
+        line_end = content.find('\n', ws_end)
+        if line_end == -1:
+            line_end = len(content)
+        # Il motore prova le { raggiungibili da destra: vince l'ultima seguita da un \n} a 5000+ caratteri
+        limit = min(line_end, closers[-1] - 5000)
+        brace = content.rfind('{', name_end, limit) if limit > name_end else -1
+        if brace == -1:
+            continue
+        yield m.start()
+        pos = closers[bisect_left(closers, brace + 5001)] + 2
+
+def long_function_starts(content, ascii_only=False):
+    """Inizi dei match di MNT06: function\\s+\\w+\\s*\\([^)]*\\)\\s*\\{[\\s\\S]{100,}\\}"""
+    # La coda greedy arriva fino all'ultima } del file: al massimo un match
+    last_brace = content.rfind('}')
+    for m in FUNCTION_HEADER_RE[ascii_only].finditer(content):
+        if m.end() + 100 <= last_brace:
+            yield m.start()
+            return
+
+# HYG04/HYG05/HYG06 e MNT02 si risolvono con str.find/str.split al posto del motore regex
+def trailing_space_starts(content, ascii_only=False):
+    """Inizi dei match di HYG04: ' +$' (multiline)"""
+    ends = []
+    pos = content.find(' \n')
+    while pos != -1:
+        ends.append(pos)
+        pos = content.find(' \n', pos + 2)
+    if content.endswith(' '):
+        ends.append(len(content) - 1)
+    for end in ends:
+        start = end
+        while start > 0 and content[start - 1] == ' ':
+            start -= 1
+        yield start
+
+def blank_lines_starts(content, ascii_only=False):
+    """Inizi dei match di HYG05: '\\n{4,}'"""
+    pos = content.find('\n\n\n\n')
+    while pos != -1:
+        yield pos
+        end = pos + 4
+        while end < len(content) and content[end] == '\n':
+            end += 1
+        pos = content.find('\n\n\n\n', end)
+
+def long_line_starts(content, ascii_only=False):
+    """Inizi dei match di MNT02: '^.{200,}$' (multiline)"""
+    pos = 0
+    for line in content.split('\n'):
+        if len(line) >= 200:
+            yield pos
+        pos += len(line) + 1
+
+def mixed_indent_starts(content, ascii_only=False):
+    """Inizi dei match di HYG06: '^\\t+ +' (multiline)"""
+    pos = content.find('\t ')
+    while pos != -1:
+        line_start = content.rfind('\n', 0, pos) + 1
+        if content.count('\t', line_start, pos + 1) == pos + 1 - line_start:
+            yield line_start
+        next_line = content.find('\n', pos)
+        if next_line == -1:
+            return
+        pos = content.find('\t ', next_line)
+
+SPAN_MATCHERS = {
+    'MNT04': god_object_starts,
+    'MNT06': long_function_starts,
+    'HYG04': trailing_space_starts,
+    'HYG05': blank_lines_starts,
+    'HYG06': mixed_indent_starts,
+    'MNT02': long_line_starts,
+}
+
+# Regole che non possono mai matchare testo sovrapposto: un solo finditer
+# sull'alternanza dei loro pattern dà gli stessi match dei finditer separati.
+FUSED_GROUPS = [
+    ('STB03', 'STB04', 'STB05'),  # // o # seguito da TODO / FIXME / XXX
+    ('SEC10', 'STB06'),           # http:// esterno / http(s)://localhost
+]
+
+FUSED_RULES = {}
+for _ids in FUSED_GROUPS:
+    _members = [r for r in ALL_REGEX_RULES if r['id'] in _ids]
+    if len(_members) < 2:
+        continue
+    _fused = '|'.join(f"(?P<{r['id']}>{r['pattern']})" for r in _members)
+    _group = {
+        'ids': tuple(r['id'] for r in _members),
+        'compiled': re.compile(_fused, re.MULTILINE | re.IGNORECASE),
+        'compiled_ascii': re.compile(_fused, re.MULTILINE | re.IGNORECASE | re.ASCII),
+    }
+    for r in _members:
+        FUSED_RULES[r['id']] = _group
+
+def fused_starts(group, content, pattern_key):
+    """Inizi dei match (max 3 per regola) di tutte le regole di un gruppo, in una passata"""
+    starts = {rule_id: [] for rule_id in group['ids']}
+    pending = len(starts)
+    for m in group[pattern_key].finditer(content):
+        found = starts[m.lastgroup]
+        if len(found) < 3:
+            found.append(m.start())
+            if len(found) == 3:
+                pending -= 1
+                if not pending:
+                    break
+    return starts
+
+# Regole regex sostituite dal controllo AST sui file Python che compilano
+AST_RULE_IDS = frozenset({'SEC06', 'HYG02'})
+
+def python_calls(content):
+    """Chiamate a eval()/print() come [nome, riga] nell'ordine di ast.walk, o None se il sorgente non compila"""
     try:
-        tree = ast.parse(content)
-        for node in ast.walk(tree):
-            # Detect eval() usage
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'eval':
-                violations.append({
-                    "rule_id": "SEC06",
-                    "line": node.lineno,
-                    "desc": "Real eval() call detected via AST"
-                })
-            # Detect print() in non-test files
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'print':
-                if 'test' not in filepath:
-                    violations.append({
-                        "rule_id": "HYG02",
-                        "line": node.lineno,
-                        "desc": "Print statement in production code"
-                    })
+        return [[node.func.id, node.lineno] for node in ast.walk(ast.parse(content))
+                if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in ('eval', 'print')]
     except SyntaxError:
-        pass  # Ignore syntax errors, regex will still catch some issues
+        return None
+
+def check_python_ast_violations(filepath, calls):
+    """Use AST to detect Python-specific violations (reduces false positives)"""
+    violations = []
+    for name, lineno in calls:
+        # Detect eval() usage
+        if name == 'eval':
+            violations.append({
+                "rule_id": "SEC06",
+                "line": lineno,
+                "desc": "Real eval() call detected via AST"
+            })
+        # Detect print() in non-test files
+        elif 'test' not in filepath:
+            violations.append({
+                "rule_id": "HYG02",
+                "line": lineno,
+                "desc": "Print statement in production code"
+            })
     return violations
 
+# Lazy commit message patterns (GIT01) e ticket ID (GIT07), compilati all'import
+LAZY_COMMIT_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'^(wip|fix|test|asdasd|asd|tmp|temp|debug|update|changes)$',
+    r'^(merge|rebase|commit|push)$',
+    r'^\.$',
+    r'^[0-9]+$',
+)]
+TICKET_ID_RE = re.compile(r'[A-Z]+-[0-9]+')
+
+# Penalità fisse delle regole GIT, già moltiplicate per la brutal mode
+GIT_PENALTIES = {rule_id: weight * PENALTY_MULTIPLIER for rule_id, weight in (
+    ('GIT01', 15), ('GIT02', 30), ('GIT03', 10), ('GIT04', 40), ('GIT05', 50), ('GIT06', 20), ('GIT07', 12),
+)}
+
 def audit_git_history():
     """Analyze last 50 commits for behavioral anti-patterns"""
     git_violations = []
@@ -237,12 +619,14 @@ def audit_git_history():
         return git_deductions, git_violations
     
     try:
-        # Fix GitHub Actions dubious ownership issue
-        subprocess.run(
-            ['git', 'config', '--global', '--add', 'safe.directory', '*'],
-            capture_output=True,
-            timeout=5
-        )
+        # Fix GitHub Actions dubious ownership issue (solo in CI: in locale non serve
+        # un processo in più, né un'altra riga nella config globale dell'utente)
+        if os.environ.get("GITHUB_ACTIONS") == "true":
+            subprocess.run(
+                ['git', 'config', '--global', '--add', 'safe.directory', '*'],
+                capture_output=True,
+                timeout=5
+            )
         
         # Get last 50 commits: hash|author|date|message
         result = subprocess.run(
@@ -272,14 +656,6 @@ def audit_git_history():
             print("::warning::To enable git audit, use: actions/checkout@v4 with fetch-depth: 50")
             return git_deductions, git_violations
         
-        # Lazy commit message patterns
-        lazy_patterns = [
-            r'^(wip|fix|test|asdasd|asd|tmp|temp|debug|update|changes)$',
-            r'^(merge|rebase|commit|push)$',
-            r'^\.$',
-            r'^[0-9]+$',
-        ]
-        
         # Unprofessional keywords
         unpro_keywords = ['oops', 'lol', 'yolo', 'fml', 'wtf', 'fuck', 'shit', 'hope this works', 'fingers crossed', 'idk']
         
@@ -287,7 +663,7 @@ def audit_git_history():
             if not commit_line:
                 continue
             
-            parts = commit_line.split('|')
+            parts = commit_line.split('|', 3)  # il messaggio può contenere '|'
             if len(parts) < 4:
                 continue
             
@@ -297,9 +673,9 @@ def audit_git_history():
             message = parts[3].lower()
             
             # GIT01: Lazy commit message
-            for pattern in lazy_patterns:
-                if re.match(pattern, message, re.IGNORECASE):
-                    penalty = 15 * (2 if INPUT_BRUTAL_MODE else 1)
+            for pattern in LAZY_COMMIT_RES:
+                if pattern.match(message):
+                    penalty = GIT_PENALTIES['GIT01']
                     git_deductions += penalty
                     git_violations.append({
                         "file": f"commit {commit_hash}",
@@ -313,7 +689,7 @@ def audit_git_history():
             
             # GIT02: Revert war
             if 'revert "revert' in message:
-                penalty = 30 * (2 if INPUT_BRUTAL_MODE else 1)
+                penalty = GIT_PENALTIES['GIT02']
                 git_deductions += penalty
                 git_violations.append({
                     "file": f"commit {commit_hash}",
@@ -327,7 +703,7 @@ def audit_git_history():
             # GIT03: Unprofessional commit
             for keyword in unpro_keywords:
                 if keyword in message:
-                    penalty = 10 * (2 if INPUT_BRUTAL_MODE else 1)
+                    penalty = GIT_PENALTIES['GIT03']
                     git_deductions += penalty
                     git_violations.append({
                         "file": f"commit {commit_hash}",
@@ -339,43 +715,42 @@ def audit_git_history():
                     print(f"::warning::[GIT03] Unprofessional: {commit_hash} contains '{keyword}' (-{penalty} pts)")
                     break
             
-            # GIT05: Friday deploy (after 16:00)
-            if 'Fri' in date_str:
-                time_part = date_str.split()[1]  # "18:30"
+            # Giorno e ora del commit ("Fri 18:30"), letti una volta per GIT05 e GIT06
+            try:
+                weekday, time_part = date_str.split()
                 hour = int(time_part.split(':')[0])
-                if hour >= 16:
-                    penalty = 50 * (2 if INPUT_BRUTAL_MODE else 1)
-                    git_deductions += penalty
-                    git_violations.append({
-                        "file": f"commit {commit_hash}",
-                        "rule": "Friday Deploy",
-                        "id": "GIT05",
-                        "deduction": penalty,
-                        "desc": f"Committed on Friday at {time_part}"
-                    })
-                    print(f"::warning::[GIT05] Friday deploy: {commit_hash} at {time_part} (-{penalty} pts)")
+            except ValueError:
+                weekday, time_part, hour = '', '', -1
+            
+            # GIT05: Friday deploy (after 16:00)
+            if weekday == 'Fri' and hour >= 16:
+                penalty = GIT_PENALTIES['GIT05']
+                git_deductions += penalty
+                git_violations.append({
+                    "file": f"commit {commit_hash}",
+                    "rule": "Friday Deploy",
+                    "id": "GIT05",
+                    "deduction": penalty,
+                    "desc": f"Committed on Friday at {time_part}"
+                })
+                print(f"::warning::[GIT05] Friday deploy: {commit_hash} at {time_part} (-{penalty} pts)")
             
             # GIT06: 3AM commits (00:00-05:59)
-            try:
-                time_part = date_str.split()[1]
-                hour = int(time_part.split(':')[0])
-                if 0 <= hour < 6:
-                    penalty = 20 * (2 if INPUT_BRUTAL_MODE else 1)
-                    git_deductions += penalty
-                    git_violations.append({
-                        "file": f"commit {commit_hash}",
-                        "rule": "3AM Commit",
-                        "id": "GIT06",
-                        "deduction": penalty,
-                        "desc": f"Committed at {time_part} (ungodly hours)"
-                    })
-                    print(f"::warning::[GIT06] 3AM commit: {commit_hash} at {time_part} (-{penalty} pts)")
-            except (IndexError, ValueError):
-                pass
+            if 0 <= hour < 6:
+                penalty = GIT_PENALTIES['GIT06']
+                git_deductions += penalty
+                git_violations.append({
+                    "file": f"commit {commit_hash}",
+                    "rule": "3AM Commit",
+                    "id": "GIT06",
+                    "deduction": penalty,
+                    "desc": f"Committed at {time_part} (ungodly hours)"
+                })
+                print(f"::warning::[GIT06] 3AM commit: {commit_hash} at {time_part} (-{penalty} pts)")
             
             # GIT07: Missing ticket ID (simple check for PROJ-123 pattern)
-            if not re.search(r'[A-Z]+-[0-9]+', message):
-                penalty = 12 * (2 if INPUT_BRUTAL_MODE else 1)
+            if not TICKET_ID_RE.search(message):
+                penalty = GIT_PENALTIES['GIT07']
                 git_deductions += penalty
                 git_violations.append({
                     "file": f"commit {commit_hash}",
@@ -387,22 +762,32 @@ def audit_git_history():
                 # Don't print for GIT07 to avoid spam
         
         # GIT04: Monster commits (check file count in each commit)
-        for commit_line in commits[:10]:  # Check only last 10 for performance
-            if not commit_line:
-                continue
-            commit_hash = commit_line.split('|')[0]
-            
-            stat_result = subprocess.run(
-                ['git', 'diff-tree', '--no-commit-id', '--numstat', '-r', commit_hash],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
+        # Un solo git diff-tree --stdin per gli ultimi 10 commit: stesso output del
+        # diff-tree per commit (niente root né merge), ma un processo invece di dieci
+        commit_hashes = [line.split('|')[0] for line in commits[:10] if line]  # Check only last 10 for performance
+        stat_result = subprocess.run(
+            ['git', 'diff-tree', '--stdin', '--numstat', '-r'],
+            input='\n'.join(commit_hashes) + '\n',
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        
+        if stat_result.returncode == 0:
+            # Ogni commit con modifiche apre con il suo hash, seguito da una riga per file
+            file_counts = {}
+            current = None
+            for stat_line in stat_result.stdout.splitlines():
+                if '\t' in stat_line:
+                    file_counts[current] += 1
+                elif stat_line:
+                    current = stat_line
+                    file_counts[current] = 0
             
-            if stat_result.returncode == 0:
-                file_count = len(stat_result.stdout.strip().split('\n'))
+            for commit_hash in commit_hashes:
+                file_count = file_counts.get(commit_hash, 0)
                 if file_count > 50:
-                    penalty = 40 * (2 if INPUT_BRUTAL_MODE else 1)
+                    penalty = GIT_PENALTIES['GIT04']
                     git_deductions += penalty
                     git_violations.append({
                         "file": f"commit {commit_hash[:7]}",
@@ -422,10 +807,219 @@ def audit_git_history():
     
     return git_deductions, git_violations
 
+def scan_one_file(task):
+    """
+    Scansiona un singolo file (anche dentro un worker del pool).
+    Restituisce (deduzioni, violazioni, righe di output, file letto, stop brutal mode):
+    le annotazioni vengono stampate dal processo principale nell'ordine dei file.
+    """
+    file, filepath = task
+    deductions = 0
+    violations = []
+    out = []
+    scanned = False
+
+    # 1. Check Filename Rules
+    for r in FILENAME_RULES:
+        if r['test'](file):
+            penalty = r['weight'] * PENALTY_MULTIPLIER
+            deductions += penalty
+            violations.append({
+                "file": filepath, 
+                "rule": r['name'], 
+                "id": r['id'],
+                "deduction": penalty,
+                "desc": r['desc']
+            })
+            out.append(f"::error file={filepath}::[{r['id']}] {r['name']} (-{penalty} pts)")
+            
+            # Brutal Mode: Fail Fast on Critical
+            if INPUT_BRUTAL_MODE and r.get('critical', False):
+                out.append(f"::error::💀 BRUTAL MODE: Critical violation detected. Terminating immediately.")
+                out.append(f"::error::Rule {r['id']}: {r['name']} in {filepath}")
+                return deductions, violations, out, scanned, True
+    # 2. Check Path Rules
+    for r in PATH_RULES:
+        if r['test'](filepath):
+            penalty = r['weight'] * PENALTY_MULTIPLIER
+            deductions += penalty
+            violations.append({
+                "file": filepath, 
+                "rule": r['name'], 
+                "id": r['id'],
+                "deduction": penalty,
+                "desc": r['desc']
+            })
+            out.append(f"::error file={filepath}::[{r['id']}] {r['name']} (-{penalty} pts)")
+            
+            if INPUT_BRUTAL_MODE and r.get('critical', False):
+                out.append(f"::error::💀 BRUTAL MODE: Critical violation. Terminating.")
+                return deductions, violations, out, scanned, True
+
+    # 3. Check Content (solo file testuali)
+    file_ext = os.path.splitext(file)[1]
+    if file_ext in TEXT_EXTENSIONS:
+        # Minificati, troppo grandi e binari non si analizzano ma contano tra i file
+        # scansionati, come prima che venissero saltati
+        if file.endswith(MINIFIED_SUFFIXES):
+            return deductions, violations, out, True, False
+        try:
+            if os.stat(filepath).st_size > MAX_FILE_SIZE:
+                # Contenuto non analizzato, ma le righe si contano comunque (MNT01)
+                deductions += check_line_count(filepath, count_file_lines(filepath), violations, out)
+                return deductions, violations, out, True, False
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+                scanned = True
+                # Un byte NUL vuol dire file binario: niente regex
+                if '\x00' in content:
+                    return deductions, violations, out, scanned, False
+                line_count = count_lines(content)
+                lines = None  # splitlines() solo se serve il testo di una riga
+                
+                # Python AST analysis for precision: se il file compila,
+                # SEC06/HYG02 vengono solo dall'AST e le loro regex si saltano
+                ast_rule_ids = ()
+                calls = python_calls(content) if file_ext == '.py' else None
+                if calls is not None:  # None = syntax error: regex will still catch some issues
+                    ast_rule_ids = AST_RULE_IDS
+                    for av in check_python_ast_violations(filepath, calls):
+                        rule = RULES_BY_ID.get(av['rule_id'])
+                        if rule and rule['id'] not in IGNORE_RULES:
+                            penalty = rule['weight'] * PENALTY_MULTIPLIER
+                            deductions += penalty
+                            violations.append({
+                                "file": filepath,
+                                "rule": rule['name'],
+                                "id": rule['id'],
+                                "deduction": penalty,
+                                "desc": av['desc'],
+                                "line": av['line']
+                            })
+                            out.append(f"::warning file={filepath},line={av['line']}::[{rule['id']}] {rule['name']} (AST) (-{penalty} pts)")
+                
+                # Check Line Count
+                deductions += check_line_count(filepath, line_count, violations, out)
+
+                # Check EOF Newline
+                for r in EOF_RULES:
+                    if content and not content.endswith('\n'):
+                        penalty = r['weight'] * PENALTY_MULTIPLIER
+                        deductions += penalty
+                        violations.append({
+                            "file": filepath, 
+                            "rule": r['name'], 
+                            "id": r['id'],
+                            "deduction": penalty,
+                            "desc": r['desc']
+                        })
+                        out.append(f"::warning file={filepath}::[{r['id']}] {r['name']} (-{penalty} pts)")
+
+                pattern_key = 'compiled'
+                if content.isascii() and not UNICODE_SENSITIVE_RE.search(content):
+                    pattern_key = 'compiled_ascii'
+
+                # Prefiltro re2 solo dove dà gli stessi match di re: testo sul percorso ASCII
+                # e senza \x0b (il \s di re2 non matcha né \x0b né \x1c-\x1f)
+                regex_hits = None
+                if REGEX_SET is not None and pattern_key == 'compiled_ascii' and '\x0b' not in content:
+                    regex_hits = set(REGEX_SET.Match(content) or ())
+
+                # Senza prefiltro re2, su testo ASCII basta cercare il prefisso letterale
+                literal_content = None
+                if regex_hits is None and pattern_key == 'compiled_ascii':
+                    literal_content = content.lower()
+
+                # Offset di inizio riga, calcolati al primo match: numero di riga via bisect
+                line_starts = None
+                # Match dei gruppi fusi, calcolati alla prima regola del gruppo
+                group_starts = {}
+                # Riga -> è un commento? (is_comment_line una sola volta per riga)
+                comment_lines = {}
+
+                # Check Regex Patterns (with smart comment detection)
+                for r in REGEX_RULES:
+                    if r['id'] in ast_rule_ids:
+                        continue
+                    set_index = REGEX_SET_INDEX.get(r['id'])
+                    if regex_hits is not None and set_index is not None and set_index not in regex_hits:
+                        continue
+                    if literal_content is not None and r['literal'] and r['literal'] not in literal_content:
+                        continue
+                    # Limita a 3 match per regola per file: il motore si ferma al terzo
+                    matcher = SPAN_MATCHERS.get(r['id'])
+                    group = FUSED_RULES.get(r['id'])
+                    if matcher is not None:
+                        starts = matcher(content, pattern_key == 'compiled_ascii')
+                    elif group is not None:
+                        if r['id'] not in group_starts:
+                            group_starts.update(fused_starts(group, content, pattern_key))
+                        starts = group_starts[r['id']]
+                    else:
+                        starts = (m.start() for m in r[pattern_key].finditer(content))
+                    for start in islice(starts, 3):
+                        if line_starts is None:
+                            line_starts = [0] + [nl.end() for nl in NEWLINE_RE.finditer(content)]
+                        line_num = bisect_right(line_starts, start)
+                        
+                        # Smart filtering: Skip code-related rules if line is a comment
+                        # (una volta per riga, anche se più regole matchano sulla stessa)
+                        if r['id'] not in COMMENT_EXEMPT_IDS:
+                            is_comment = comment_lines.get(line_num)
+                            if is_comment is None:
+                                if lines is None:
+                                    lines = content.splitlines()
+                                line_content = lines[line_num - 1] if line_num <= len(lines) else ""
+                                is_comment = comment_lines[line_num] = is_comment_line(line_content, file_ext)
+                            if is_comment:
+                                continue  # Ignore code violations in comment lines
+                        
+                        penalty = r['weight'] * PENALTY_MULTIPLIER
+                        deductions += penalty
+                        violations.append({
+                            "file": filepath, 
+                            "rule": r['name'], 
+                            "id": r['id'],
+                            "deduction": penalty,
+                            "desc": r['desc'],
+                            "line": line_num
+                        })
+                        out.append(f"::warning file={filepath},line={line_num}::[{r['id']}] {r['name']} (-{penalty} pts)")
+                        
+                        # Brutal Mode: Fail Fast on Critical
+                        if INPUT_BRUTAL_MODE and r.get('critical', False):
+                            out.append(f"::error::💀 BRUTAL MODE: Critical security violation!")
+                            out.append(f"::error::Rule {r['id']}: {r['name']} at {filepath}:{line_num}")
+                            return deductions, violations, out, scanned, True
+
+        except Exception as e:
+            # Skip binary files or permission errors
+            pass
+
+    return deductions, violations, out, scanned, False
+
+
+def summarize_violations(summary, new_violations):
+    """
+    Aggiunge violazioni al riepilogo per categoria (SEC, STB, MNT, ...):
+    per ognuna tiene conteggio, deduzioni totali e solo le prime 10, le uniche
+    mostrate nel Job Summary, invece della lista completa.
+    """
+    for v in new_violations:
+        category = RULE_CATEGORY.get(v['id']) or v['id'][:3]
+        entry = summary.get(category)
+        if entry is None:
+            entry = summary[category] = {'count': 0, 'total': 0, 'first': []}
+        entry['count'] += 1
+        entry['total'] += v['deduction']
+        if len(entry['first']) < 10:
+            entry['first'].append(v)
+
 def run_scan():
     """Esegue la scansione completa del repository"""
     score = STARTING_SCORE
-    violations = []
+    violations = {}
+    violation_count = 0
     
     mode_indicator = "🔥 BRUTAL MODE" if INPUT_BRUTAL_MODE else "Standard Mode"
     print(f"::group::🔍 Starting VibeGuard Scan ({mode_indicator}, Threshold: {INPUT_THRESHOLD})")
@@ -438,187 +1032,114 @@ def run_scan():
 
     files_scanned = 0
     
-    for root, dirs, files in os.walk("."):
-        # Filtra directory da ignorare
-        dirs[:] = [d for d in dirs if d not in IGNORE_DIRS]
-        
-        for file in files:
-            if file in IGNORE_FILES:
-                continue
-                
-            filepath = os.path.relpath(os.path.join(root, file))
-            
-            # Check exclusion patterns
-            if is_excluded(filepath):
-                continue
-            
-            # 1. Check Filename Rules
-            for r in RULES:
-                if r['id'] in IGNORE_RULES:
-                    continue
-                if r['type'] == 'filename' and re.search(r['pattern'], file):
-                    penalty = r['weight'] * (2 if INPUT_BRUTAL_MODE else 1)
-                    score -= penalty
-                    violations.append({
-                        "file": filepath, 
-                        "rule": r['name'], 
-                        "id": r['id'],
-                        "deduction": penalty,
-                        "desc": r['desc']
-                    })
-                    print(f"::error file={filepath}::[{r['id']}] {r['name']} (-{penalty} pts)")
-                    
-                    # Brutal Mode: Fail Fast on Critical
-                    if INPUT_BRUTAL_MODE and r.get('critical', False):
-                        print(f"::error::💀 BRUTAL MODE: Critical violation detected. Terminating immediately.")
-                        print(f"::error::Rule {r['id']}: {r['name']} in {filepath}")
-                        sys.exit(1)
-                    score -= r['weight']
-                    violations.append({
-                        "file": filepath, 
-                        "rule": r['name'], 
-                        "id": r['id'],
-                        "deduction": r['weight'],
-                        "desc": r['desc']
-                    })
-            # 2. Check Path Rules
-            for r in RULES:
-                if r['id'] in IGNORE_RULES:
-                    continue
-                if r['type'] == 'path' and re.search(r['pattern'], filepath):
-                    penalty = r['weight'] * (2 if INPUT_BRUTAL_MODE else 1)
-                    score -= penalty
-                    violations.append({
-                        "file": filepath, 
-                        "rule": r['name'], 
-                        "id": r['id'],
-                        "deduction": penalty,
-                        "desc": r['desc']
-                    })
-                    print(f"::error file={filepath}::[{r['id']}] {r['name']} (-{penalty} pts)")
-                    
-                    if INPUT_BRUTAL_MODE and r.get('critical', False):
-                        print(f"::error::💀 BRUTAL MODE: Critical violation. Terminating.")
-                        sys.exit(1)
-
-            # 3. Check Content (solo file testuali)
-            file_ext = os.path.splitext(file)[1]
-            if file.endswith(('.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.java', '.c', '.cpp', '.h', 
-                             '.rb', '.php', '.html', '.css', '.scss', '.sass', '.vue', '.svelte',
-                             '.md', '.txt', '.yml', '.yaml', '.json', '.xml', '.sh', '.bash')):
-                try:
-                    with open(os.path.join(root, file), 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        lines = content.splitlines()
-                        files_scanned += 1
-                        
-                        # Python AST analysis for precision
-                        if file_ext == '.py':
-                            ast_violations = check_python_ast_violations(filepath, content)
-                            for av in ast_violations:
-                                rule = next((r for r in RULES if r['id'] == av['rule_id']), None)
-                                if rule and rule['id'] not in IGNORE_RULES:
-                                    penalty = rule['weight'] * (2 if INPUT_BRUTAL_MODE else 1)
-                                    score -= penalty
-                                    violations.append({
-                                        "file": filepath,
-                                        "rule": rule['name'],
-                                        "id": rule['id'],
-                                        "deduction": penalty,
-                                        "desc": av['desc'],
-                                        "line": av['line']
-                                    })
-                                    print(f"::warning file={filepath},line={av['line']}::[{rule['id']}] {rule['name']} (AST) (-{penalty} pts)")
-                        
-                        # Check Line Count
-                        for r in RULES:
-                            if r['id'] in IGNORE_RULES:
-                                continue
-                            if r['type'] == 'lines' and len(lines) > r.get('max', float('inf')):
-                                penalty = r['weight'] * (2 if INPUT_BRUTAL_MODE else 1)
-                                score -= penalty
-                                violations.append({
-                                    "file": filepath, 
-                                    "rule": f"{r['name']} ({len(lines)} lines)", 
-                                    "id": r['id'],
-                                    "deduction": penalty,
-                                    "desc": r['desc']
-                                })
-                                print(f"::warning file={filepath}::[{r['id']}] File has {len(lines)} lines (-{penalty} pts)")
-
-                        # Check EOF Newline
-                        for r in RULES:
-                            if r['id'] in IGNORE_RULES:
-                                continue
-                            if r['type'] == 'eof' and content and not content.endswith('\n'):
-                                penalty = r['weight'] * (2 if INPUT_BRUTAL_MODE else 1)
-                                score -= penalty
-                                violations.append({
-                                    "file": filepath, 
-                                    "rule": r['name'], 
-                                    "id": r['id'],
-                                    "deduction": penalty,
-                                    "desc": r['desc']
-                                })
-                                print(f"::warning file={filepath}::[{r['id']}] {r['name']} (-{penalty} pts)")
-
-                        # Check Regex Patterns (with smart comment detection)
-                        for r in RULES:
-                            if r['id'] in IGNORE_RULES:
-                                continue
-                            if r['type'] == 'regex':
-                                matches = list(re.finditer(r['pattern'], content, re.MULTILINE | re.IGNORECASE))
-                                if matches:
-                                    for match in matches[:3]:  # Limita a 3 match per regola per file
-                                        line_num = content[:match.start()].count('\n') + 1
-                                        line_content = lines[line_num - 1] if line_num <= len(lines) else ""
-                                        
-                                        # Smart filtering: Skip code-related rules if line is a comment
-                                        is_comment = is_comment_line(line_content, file_ext)
-                                        if is_comment and not r['id'].startswith(('DOC', 'STB03', 'STB04', 'STB05')):
-                                            continue  # Ignore code violations in comment lines
-                                        
-                                        penalty = r['weight'] * (2 if INPUT_BRUTAL_MODE else 1)
-                                        score -= penalty
-                                        violations.append({
-                                            "file": filepath, 
-                                            "rule": r['name'], 
-                                            "id": r['id'],
-                                            "deduction": penalty,
-                                            "desc": r['desc'],
-                                            "line": line_num
-                                        })
-                                        print(f"::warning file={filepath},line={line_num}::[{r['id']}] {r['name']} (-{penalty} pts)")
-                                        
-                                        # Brutal Mode: Fail Fast on Critical
-                                        if INPUT_BRUTAL_MODE and r.get('critical', False):
-                                            print(f"::error::💀 BRUTAL MODE: Critical security violation!")
-                                            print(f"::error::Rule {r['id']}: {r['name']} at {filepath}:{line_num}")
-                                            sys.exit(1)
-
-                except Exception as e:
-                    # Skip binary files or permission errors
-                    pass
+    # Check exclusion patterns
+    tasks = [(file, filepath) for file, filepath in walk_files() if not is_excluded(filepath)]
+
+    # Pool di processi solo se ci sono abbastanza file da ripagarne l'avvio
+    workers = os.cpu_count() or 1
+    executor = None
+    pool_errors = ()  # errori del pool che fanno ripiegare sulla scansione seriale
+    results = None
+    if workers > 1 and len(tasks) >= PARALLEL_MIN_FILES:
+        try:
+            # import costosi: solo se serve
+            from concurrent.futures import ProcessPoolExecutor
+            from concurrent.futures.process import BrokenProcessPool
+            pool_errors = (OSError, NotImplementedError, BrokenProcessPool)
+            sys.stdout.flush()
+            # I worker ricevono la config: con spawn/forkserver rieseguono il modulo senza main()
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=apply_config,
+                                           initargs=(IGNORE_RULES, EXCLUDE_PATTERNS))
+            results = executor.map(scan_one_file, tasks, chunksize=32)
+        except (ImportError, OSError, NotImplementedError):
+            # Piattaforma senza multiprocessing funzionante: si va in serie
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            executor = None
+    if results is None:
+        results = map(scan_one_file, tasks)
+
+    # Le annotazioni si accumulano e vanno su stdout con una sola write
+    annotations = []
+    fatal = False
+    aborted = False
+    done = 0  # file già raccolti, nell'ordine dei task
+    try:
+        while True:
+            try:
+                for deductions, file_violations, out, scanned, fatal in results:
+                    done += 1
+                    score -= deductions
+                    summarize_violations(violations, file_violations)
+                    violation_count += len(file_violations)
+                    files_scanned += scanned
+                    annotations.extend(out)
+                    if fatal:
+                        break
+                    # Le deduzioni si sommano soltanto: sotto soglia il FAILED non può più cambiare
+                    if FAIL_FAST and score < INPUT_THRESHOLD:
+                        aborted = True
+                        break
+                break
+            except pool_errors:
+                # Worker morti o pool inutilizzabile: i file non ancora raccolti si fanno in serie
+                executor.shutdown(wait=False, cancel_futures=True)
+                executor = None
+                pool_errors = ()
+                results = map(scan_one_file, tasks[done:])
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        if annotations:
+            sys.stdout.write("\n".join(annotations) + "\n")
+            sys.stdout.flush()
+
+    if fatal:
+        sys.exit(1)
 
     print("")
     print(f"📁 Files Scanned: {files_scanned}")
-    print(f"⚠️  Total Violations: {len(violations)}")
+    print(f"⚠️  Total Violations: {violation_count}")
     print(f"📉 Total Deductions: {STARTING_SCORE - score} pts")
+    if aborted:
+        print(f"⏩ Fail-fast: scan stopped early, score already below threshold {INPUT_THRESHOLD}")
     print("::endgroup::")
     
+    if aborted:
+        return score, violations, aborted
+    
     # ========== GIT HISTORY AUDIT ==========
     print("")
     print("::group::🌿 Auditing Git History (Last 50 Commits)")
     git_deductions, git_violations = audit_git_history()
     score -= git_deductions
-    violations.extend(git_violations)
+    summarize_violations(violations, git_violations)
     print(f"📊 Git Deductions: -{git_deductions} pts")
     print(f"⚠️  Git Violations: {len(git_violations)}")
     print("::endgroup::")
     
-    return score, violations
+    return score, violations, aborted
+
+# Intestazioni del Job Summary per categoria
+CATEGORY_NAMES = {
+    'SEC': '🔒 Security',
+    'STB': '⚡ Stability', 
+    'MNT': '🔧 Maintainability',
+    'HYG': '🧹 Code Hygiene',
+    'SME': '👃 Code Smells',
+    'TST': '🧪 Testing',
+    'PRF': '⚡ Performance',
+    'DOC': '📝 Documentation',
+    'DEP': '📦 Dependencies',
+    'VCS': '🌿 Version Control',
+    'NAM': '🏷️  Naming',
+    'UX': '🎨 UI/UX',
+    'AI': '🤖 AI Slop',
+    'RCT': '⚛️  React',
+    'GIT': '🌿 Git Hygiene'
+}
 
-def write_summary(score, violations):
+def write_summary(score, violations, aborted=False):
     """Scrive il Job Summary in formato Markdown nativo di GitHub"""
     summary_file = os.environ.get("GITHUB_STEP_SUMMARY")
     if not summary_file:
@@ -629,84 +1150,62 @@ def write_summary(score, violations):
     bar_width = 20
     bar_filled = int((score / STARTING_SCORE) * bar_width)
     progress_bar = "█" * bar_filled + "░" * (bar_width - bar_filled)
+    fail_fast_note = ""
+    if aborted:
+        fail_fast_note = "\n> ⏩ **Fail-fast:** the scan stopped once the score fell below the threshold, so the full score is at most this value.\n"
     
-    md = f"""# {status_emoji} VibeGuard Code Quality Report
+    md = [f"""# {status_emoji} VibeGuard Code Quality Report
 
 ## 📊 Final Score
 
 **Score:** `{score}/{STARTING_SCORE}` {progress_bar}  
 **Threshold:** `{INPUT_THRESHOLD}`  
 **Status:** **{status_text}**
-
+{fail_fast_note}
 ---
 
-## 📉 Violations Detected ({len(violations)})
+## 📉 Violations Detected ({sum(e['count'] for e in violations.values())})
 
-"""
+"""]
     
     if violations:
-        # Raggruppa per categoria
-        categories = {}
-        for v in violations:
-            rule_id = v['id']
-            category = rule_id[:3]  # SEC, STB, MNT, etc.
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(v)
-        
-        category_names = {
-            'SEC': '🔒 Security',
-            'STB': '⚡ Stability', 
-            'MNT': '🔧 Maintainability',
-            'HYG': '🧹 Code Hygiene',
-            'SME': '👃 Code Smells',
-            'TST': '🧪 Testing',
-            'PRF': '⚡ Performance',
-            'DOC': '📝 Documentation',
-            'DEP': '📦 Dependencies',
-            'VCS': '🌿 Version Control',
-            'NAM': '🏷️  Naming',
-            'UX': '🎨 UI/UX',
-            'AI': '🤖 AI Slop',
-            'RCT': '⚛️  React',
-            'GIT': '🌿 Git Hygiene'
-        }
-        
-        for cat_id in sorted(categories.keys()):
-            cat_name = category_names.get(cat_id, cat_id)
-            cat_violations = categories[cat_id]
-            cat_total = sum(v['deduction'] for v in cat_violations)
+        # violations è il riepilogo per categoria costruito da summarize_violations
+        for cat_id in sorted(violations.keys()):
+            cat_name = CATEGORY_NAMES.get(cat_id, cat_id)
+            entry = violations[cat_id]
+            cat_total = entry['total']
             
-            md += f"### {cat_name} (-{cat_total} pts)\n\n"
-            md += "| File | Rule | Line | Penalty |\n"
-            md += "|------|------|------|--------:|\n"
+            md.append(f"### {cat_name} (-{cat_total} pts)\n\n")
+            md.append("| File | Rule | Line | Penalty |\n")
+            md.append("|------|------|------|--------:|\n")
             
-            for v in cat_violations[:10]:  # Limita a 10 per categoria nel summary
+            for v in entry['first']:  # Limita a 10 per categoria nel summary
                 file_display = v['file'][:50] + "..." if len(v['file']) > 50 else v['file']
                 line_info = f"L{v['line']}" if 'line' in v else "-"
-                md += f"| `{file_display}` | {v['rule']} | {line_info} | -{v['deduction']} |\n"
+                md.append(f"| `{file_display}` | {v['rule']} | {line_info} | -{v['deduction']} |\n")
             
-            if len(cat_violations) > 10:
-                md += f"| ... | *{len(cat_violations) - 10} more violations* | ... | ... |\n"
+            if entry['count'] > 10:
+                md.append(f"| ... | *{entry['count'] - 10} more violations* | ... | ... |\n")
             
-            md += "\n"
+            md.append("\n")
     else:
-        md += "### 🎉 No violations found!\n\n"
-        md += "Your code is **pristine**. Perfect SOTA engineering vibes. 🚀\n\n"
+        md.append("### 🎉 No violations found!\n\n")
+        md.append("Your code is **pristine**. Perfect SOTA engineering vibes. 🚀\n\n")
 
-    md += "---\n\n"
-    md += f"*Scanned with VibeGuard Auditor • Threshold: {INPUT_THRESHOLD} • [Learn More](https://github.com/fabriziosalmi/vibe-check)*\n"
+    md.append("---\n\n")
+    md.append(f"*Scanned with VibeGuard Auditor • Threshold: {INPUT_THRESHOLD} • [Learn More](https://github.com/fabriziosalmi/vibe-check)*\n")
 
     with open(summary_file, "a") as f:
-        f.write(md)
+        f.write("".join(md))
 
 def main():
     """Entry point per la GitHub Action"""
+    load_config()
     print("🛡️  VibeGuard Auditor v1.0.0")
     print("=" * 50)
     
-    score, violations = run_scan()
-    write_summary(score, violations)
+    score, violations, aborted = run_scan()
+    write_summary(score, violations, aborted)
     
     # Output per passi successivi del workflow
     github_output = os.environ.get("GITHUB_OUTPUT")